@@ -8,16 +8,52 @@ Run: python /path/to/solo_ops.py <command>
 import sys
 import os
 import re
+import fcntl
+import hashlib
+import json
+import secrets
+import threading
+import shlex
+import shutil
 import subprocess
 import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
+from urllib.parse import unquote, urlparse
 
 
 # ─── helpers ─────────────────────────────────────────────────────────────────
 
 SUPPORTED_PROVIDERS = {"claude", "codex", "opencode"}
 
+# Seconds an interactive shell (zsh + plugins) needs before it accepts input
+SHELL_WARMUP_SECONDS = 2
+
+# Seconds the provider TUI needs after launch before it accepts messages
+AI_WARMUP_SECONDS = 3
+
+# Messages longer than this (or multi-line) are pasted in one shot instead of typed
+PASTE_THRESHOLD = 200
+
+# Messages larger than this (bytes) are spooled to a file and sent as a pointer
+SPOOL_THRESHOLD = 8192
+
+# Spooled messages older than this many days are removed by `doctor`
+SPOOL_MAX_AGE_DAYS = 7
+
+# Done tasks older than this many days are packed by `archive`
+ARCHIVE_DAYS = 30
+
+# '<timestamp>-<rest>.md'; rest is '<4 hex>-<slug>' for files made by new_task_file
+TASK_NAME_RE = re.compile(r'^(\d{4}-\d{2}-\d{2}-\d{2}-\d{2}-\d{2})-(.+)\.md$')
+
+POOL_PANE_TITLE = "solo-ops-pool"
+
+PANE_INVENTORY_ENV = "SOLO_OPS_PANE_INVENTORY"
+
 
 def get_session_backend():
     backend = os.environ.get("SOLO_OPS_BACKEND", "wezterm").strip().lower()
@@ -82,23 +118,161 @@ def find_wt_base(root):
     return '.worktrees'
 
 
-def list_roles(root, wt_base):
-    base = Path(root, wt_base)
-    if not base.is_dir():
+def state_dir(root):
+    """Return solo-ops' runtime state directory (kept inside the git dir, never in a worktree)."""
+    path = Path(root, '.git', 'solo-ops')
+    if not path.parent.is_dir():
+        result = subprocess.run(
+            ['git', 'rev-parse', '--git-common-dir'],
+            cwd=root, capture_output=True, text=True
+        )
+        common = (result.stdout or '').strip() if result.returncode == 0 else ''
+        path = Path(root, common, 'solo-ops') if common else Path(root, find_wt_base(root), '.solo-ops')
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def git_worktrees(root):
+    """Parse `git worktree list --porcelain` into dicts with path, branch and prunable."""
+    result = subprocess.run(
+        ['git', 'worktree', 'list', '--porcelain'],
+        cwd=root, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return []
+    worktrees = []
+    current = None
+    for line in result.stdout.splitlines():
+        if line.startswith('worktree '):
+            current = {'path': line[len('worktree '):], 'branch': '', 'prunable': False}
+            worktrees.append(current)
+        elif current is None:
+            continue
+        elif line.startswith('branch '):
+            current['branch'] = line[len('branch '):]
+        elif line == 'prunable' or line.startswith('prunable '):
+            current['prunable'] = True
+    return worktrees
+
+
+def team_branches(root):
+    """Return role names of every local team/<name> branch (one git call)."""
+    result = subprocess.run(
+        ['git', 'for-each-ref', '--format=%(refname:short)', 'refs/heads/team/'],
+        cwd=root, capture_output=True, text=True
+    )
+    if result.returncode != 0:
         return []
+    return [line[len('team/'):] for line in result.stdout.splitlines() if line.startswith('team/')]
+
+
+def team_worktrees(root):
+    """Map role name -> worktree entry for worktrees checked out on a team/<name> branch."""
+    roles = {}
+    for wt in git_worktrees(root):
+        if wt['branch'].startswith('refs/heads/team/'):
+            roles[wt['branch'][len('refs/heads/team/'):]] = wt
+    return roles
+
+
+def current_branch(root):
+    result = subprocess.run(
+        ['git', 'symbolic-ref', '--short', 'HEAD'],
+        cwd=root, capture_output=True, text=True
+    )
+    return result.stdout.strip() if result.returncode == 0 else 'main'
+
+
+def git_workers(count):
+    return max(1, min(8, count))
+
+
+def parse_shortstat(text):
+    """Condense `git diff --shortstat` output to e.g. '3f +10 -2'."""
+    text = text.strip()
+    if not text:
+        return '-'
+    files = re.search(r'(\d+) files? changed', text)
+    added = re.search(r'(\d+) insertions?', text)
+    removed = re.search(r'(\d+) deletions?', text)
+    return (f"{files.group(1) if files else 0}f "
+            f"+{added.group(1) if added else 0} -{removed.group(1) if removed else 0}")
+
+
+def branch_progress(root, base, roles):
+    """Progress of team/<role> branches relative to base.
+
+    Returns {role: {'ahead', 'behind', 'last_commit', 'diffstat'}}. Last commit
+    times (and ahead/behind on git >= 2.41) come from one for-each-ref call; the
+    remaining per-branch queries run in parallel.
+    """
+    fields = '%(refname:short)%09%(committerdate:relative)'
+    result = subprocess.run(
+        ['git', 'for-each-ref', f'--format={fields}%09%(ahead-behind:{base})', 'refs/heads/team/'],
+        cwd=root, capture_output=True, text=True
+    )
+    batched = result.returncode == 0
+    if not batched:
+        # git < 2.41 has no ahead-behind atom; fall back to per-branch rev-list below
+        result = subprocess.run(
+            ['git', 'for-each-ref', f'--format={fields}', 'refs/heads/team/'],
+            cwd=root, capture_output=True, text=True
+        )
+
+    progress = {}
+    wanted = set(roles)
+    for line in result.stdout.splitlines():
+        parts = line.split('\t')
+        name = parts[0][len('team/'):] if parts[0].startswith('team/') else ''
+        if name not in wanted:
+            continue
+        entry = {'ahead': '?', 'behind': '?', 'last_commit': parts[1] if len(parts) > 1 else '-',
+                 'diffstat': '-'}
+        if batched and len(parts) > 2 and len(parts[2].split()) == 2:
+            entry['ahead'], entry['behind'] = parts[2].split()
+        progress[name] = entry
+
+    def query(name):
+        branch = f'team/{name}'
+        counts = None
+        if not batched:
+            rev = subprocess.run(
+                ['git', 'rev-list', '--left-right', '--count', f'{branch}...{base}'],
+                cwd=root, capture_output=True, text=True
+            )
+            if rev.returncode == 0 and len(rev.stdout.split()) == 2:
+                counts = rev.stdout.split()
+        diff = subprocess.run(
+            ['git', 'diff', '--shortstat', f'{base}...{branch}'],
+            cwd=root, capture_output=True, text=True
+        )
+        return name, counts, parse_shortstat(diff.stdout) if diff.returncode == 0 else '?'
+
+    with ThreadPoolExecutor(max_workers=git_workers(len(progress))) as pool:
+        for name, counts, diffstat in pool.map(query, list(progress)):
+            if counts:
+                progress[name]['ahead'], progress[name]['behind'] = counts
+            progress[name]['diffstat'] = diffstat
+    return progress
+
+
+def list_roles(root, wt_base):
+    """Roles registered as team/<name> worktrees under wt_base that carry a config.yaml."""
+    base = Path(root, wt_base).resolve()
     roles = []
-    for d in sorted(base.iterdir()):
-        if not d.is_dir():
+    for name, wt in team_worktrees(root).items():
+        wt_path = Path(wt['path'])
+        if wt['prunable'] or wt_path.resolve() != base / name:
             continue
-        name = d.name
-        if Path(d, 'agents', 'teams', name, 'config.yaml').is_file():
+        if Path(wt_path, 'agents', 'teams', name, 'config.yaml').is_file():
             roles.append(name)
-    return roles
+    return sorted(roles)
 
 
 def cfg_get(filepath, key):
     try:
         with open(filepath) as f:
+            fcntl.flock(f, fcntl.LOCK_SH)
             for line in f:
                 if line.startswith(f'{key}:'):
                     return line[len(key) + 1:].strip().strip('"')
@@ -108,27 +282,45 @@ def cfg_get(filepath, key):
 
 
 def cfg_set(filepath, key, value):
-    filepath = Path(filepath)
-    content = filepath.read_text() if filepath.exists() else ''
-    lines = content.splitlines(keepends=True)
+    """Set `key: value` in a flat YAML file; the read-modify-write holds an exclusive lock."""
     pattern = re.compile(f'^{re.escape(key)}:.*')
     new_line = f'{key}: {value}\n'
-    found = False
-    new_lines = []
-    for line in lines:
-        if pattern.match(line):
+    with open(filepath, 'a+') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.seek(0)
+        lines = f.read().splitlines(keepends=True)
+        found = False
+        new_lines = []
+        for line in lines:
+            if pattern.match(line):
+                new_lines.append(new_line)
+                found = True
+            else:
+                new_lines.append(line)
+        if not found:
             new_lines.append(new_line)
-            found = True
-        else:
-            new_lines.append(line)
-    if not found:
-        new_lines.append(new_line)
-    filepath.write_text(''.join(new_lines))
+        f.seek(0)
+        f.truncate()
+        f.write(''.join(new_lines))
 
 
-def pane_alive(pane_id):
-    if not pane_id:
-        return False
+def new_task_file(pending_dir, slug):
+    """Create a pending task file with a collision-free id: <timestamp>-<4 hex>.
+
+    The file is created with O_EXCL, so concurrent assigns never share a file.
+    """
+    ts = datetime.now().strftime('%Y-%m-%d-%H-%M-%S')
+    while True:
+        task_file = Path(pending_dir, f'{ts}-{secrets.token_hex(2)}-{slug}.md')
+        try:
+            with open(task_file, 'x'):
+                return task_file
+        except FileExistsError:
+            continue
+
+
+def live_pane_ids():
+    """Return the set of pane ids currently alive in the session backend (one CLI call)."""
     backend = get_session_backend()
     if backend == "tmux":
         result = subprocess.run(
@@ -136,47 +328,774 @@ def pane_alive(pane_id):
             capture_output=True, text=True
         )
         if result.returncode != 0:
-            return False
-        return str(pane_id) in {line.strip() for line in result.stdout.splitlines()}
+            return set()
+        return {line.strip() for line in result.stdout.splitlines() if line.strip()}
 
     result = subprocess.run(
         ['wezterm', 'cli', 'list'],
         capture_output=True, text=True
     )
     if result.returncode != 0:
-        return False
+        return set()
+    ids = set()
     for line in result.stdout.splitlines()[1:]:  # skip header
         parts = line.split()
-        if len(parts) >= 3 and parts[2] == str(pane_id):
-            return True
-    return False
+        if len(parts) >= 3:
+            ids.add(parts[2])
+    return ids
 
 
-def pane_send(pane_id, text):
-    """Send text + Enter to a WezTerm pane via stdin pipe."""
+def pane_alive(pane_id):
+    if not pane_id:
+        return False
+    return str(pane_id) in live_pane_ids()
+
+
+def wezterm_mux_id():
+    """Name the WezTerm GUI socket the CLI talks to, e.g. 'gui-sock-1234' ('' if unknown).
+
+    Resolved the same way whether or not the caller runs inside WezTerm:
+    WEZTERM_UNIX_SOCKET when set, else the only live gui-sock-<pid> in
+    WezTerm's runtime directory.
+    """
+    socket = os.environ.get('WEZTERM_UNIX_SOCKET', '')
+    if socket:
+        return Path(socket).name
+    runtime_dirs = [Path.home() / '.local' / 'share' / 'wezterm']
+    if os.environ.get('XDG_RUNTIME_DIR'):
+        runtime_dirs.insert(0, Path(os.environ['XDG_RUNTIME_DIR'], 'wezterm'))
+    live = set()
+    for runtime_dir in runtime_dirs:
+        if not runtime_dir.is_dir():
+            continue
+        for sock in runtime_dir.glob('gui-sock-*'):
+            pid = sock.name[len('gui-sock-'):]
+            if not pid.isdigit():
+                continue
+            try:
+                os.kill(int(pid), 0)
+            except PermissionError:
+                pass
+            except OSError:
+                continue
+            live.add(sock.name)
+    return live.pop() if len(live) == 1 else ''
+
+
+def fingerprints_match(recorded, current):
+    """Compare pane fingerprints ('<backend>:<server>:<tty>').
+
+    When either side could not identify the WezTerm instance, only the tty is
+    compared rather than declaring a live pane dead.
+    """
+    if recorded == current:
+        return True
+    rec, cur = recorded.split(':', 2), current.split(':', 2)
+    if len(rec) != 3 or len(cur) != 3 or rec[0] != cur[0] or rec[0] != 'wezterm':
+        return False
+    return (not rec[1] or not cur[1]) and rec[2] == cur[2]
+
+
+def pane_inventory(use_cache=True):
+    """One listing of every pane: {pane_id: {'cwd', 'title', 'fingerprint'}}.
+
+    The fingerprint identifies the multiplexer instance and the pane's tty, so a
+    pane id that was reused after a terminal/server restart is not mistaken for
+    the original pane. `fleet` hands a listing it already took to child
+    invocations through SOLO_OPS_PANE_INVENTORY.
+    """
+    cached = os.environ.get(PANE_INVENTORY_ENV, '') if use_cache else ''
+    if cached:
+        return json.loads(cached)
+
+    panes = {}
+    if get_session_backend() == "tmux":
+        result = subprocess.run(
+            ['tmux', 'list-panes', '-a', '-F',
+             '#{pane_id}\t#{pane_current_path}\t#{window_name}\t#{pid}\t#{pane_tty}'],
+            capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return panes
+        for line in result.stdout.splitlines():
+            parts = line.split('\t')
+            if len(parts) != 5:
+                continue
+            pane_id, cwd, title, server_pid, tty = parts
+            panes[pane_id] = {'cwd': cwd, 'title': title, 'fingerprint': f'tmux:{server_pid}:{tty}'}
+        return panes
+
+    result = subprocess.run(
+        ['wezterm', 'cli', 'list', '--format', 'json'],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return panes
+    try:
+        entries = json.loads(result.stdout)
+    except ValueError:
+        return panes
+    server = wezterm_mux_id()
+    for entry in entries:
+        cwd = entry.get('cwd') or ''
+        if cwd.startswith('file://'):
+            cwd = unquote(urlparse(cwd).path)
+        tty = entry.get('tty_name') or f"tab{entry.get('tab_id', '')}"
+        panes[str(entry.get('pane_id'))] = {
+            'cwd': cwd,
+            'title': entry.get('tab_title') or entry.get('title') or '',
+            'fingerprint': f'wezterm:{server}:{tty}',
+        }
+    return panes
+
+
+def role_pane(config, panes=None):
+    """Return the role's pane id if that pane is still alive, else ''.
+
+    When config.yaml carries a pane_fingerprint, the live pane must match it.
+    """
+    pane_id = cfg_get(str(config), 'pane_id')
+    if not pane_id:
+        return ''
+    fingerprint = cfg_get(str(config), 'pane_fingerprint')
+    if panes is None:
+        # Goes through the cached fleet snapshot when one was handed down
+        panes = pane_inventory()
+    pane = panes.get(pane_id)
+    if pane is None or (fingerprint and not fingerprints_match(fingerprint, pane['fingerprint'])):
+        return ''
+    return pane_id
+
+
+def record_pane(config, pane_id, panes=None):
+    """Store pane_id (and its fingerprint) in the role's config.yaml."""
+    # A freshly spawned pane is never in a cached listing, so always list live
+    panes = pane_inventory(use_cache=False) if panes is None else panes
+    fingerprint = panes.get(pane_id, {}).get('fingerprint', '')
+    cfg_set(str(config), 'pane_id', pane_id or '""')
+    cfg_set(str(config), 'pane_fingerprint', f'"{fingerprint}"')
+
+
+def spawn_session(cwd, title):
+    """Spawn a detached interactive shell in cwd, title it, and return its pane id ('' on failure)."""
     backend = get_session_backend()
+    current_pane = os.environ.get('WEZTERM_PANE', '')
+
     if backend == "tmux":
+        result = subprocess.run(
+            ['tmux', 'new-session', '-d', '-P', '-F', '#{pane_id}', '-c', str(cwd)],
+            capture_output=True, text=True
+        )
+    else:
+        # Spawn a new tab with an interactive shell (no command = WezTerm opens default shell)
+        # This avoids the issue where `zsh -c "claude"` causes TUI apps to exit immediately
+        result = subprocess.run(
+            ['wezterm', 'cli', 'spawn', '--cwd', str(cwd)],
+            capture_output=True, text=True
+        )
+
+    if result.returncode != 0 or not result.stdout.strip():
+        return ''
+
+    pane_id = result.stdout.strip()
+    pane_set_title(pane_id, title)
+
+    # Return focus to the caller's pane — don't steal focus
+    if backend != "tmux" and current_pane:
         subprocess.run(
-            ['tmux', 'send-keys', '-t', str(pane_id), '-l', text],
+            ['wezterm', 'cli', 'activate-pane', '--pane-id', current_pane],
             capture_output=True
         )
+    return pane_id
+
+
+def pane_set_title(pane_id, title):
+    if get_session_backend() == "tmux":
         subprocess.run(
+            ['tmux', 'rename-window', '-t', str(pane_id), title],
+            capture_output=True
+        )
+    else:
+        subprocess.run(
+            ['wezterm', 'cli', 'set-tab-title', '--pane-id', str(pane_id), title],
+            capture_output=True
+        )
+
+
+def pane_kill(pane_id):
+    """Close a pane; returns True on success."""
+    if get_session_backend() == "tmux":
+        result = subprocess.run(
+            ['tmux', 'kill-pane', '-t', str(pane_id)],
+            capture_output=True
+        )
+    else:
+        result = subprocess.run(
+            ['wezterm', 'cli', 'kill-pane', '--pane-id', str(pane_id)],
+            capture_output=True
+        )
+    return result.returncode == 0
+
+
+def pane_send(pane_id, text):
+    """Send text + Enter to a pane; returns True if every CLI call succeeded."""
+    backend = get_session_backend()
+    if backend == "tmux":
+        typed = subprocess.run(
+            ['tmux', 'send-keys', '-t', str(pane_id), '-l', text],
+            capture_output=True
+        )
+        entered = subprocess.run(
             ['tmux', 'send-keys', '-t', str(pane_id), 'Enter'],
             capture_output=True
         )
-        return
+        return typed.returncode == 0 and entered.returncode == 0
 
-    subprocess.run(
+    typed = subprocess.run(
         ['wezterm', 'cli', 'send-text', '--pane-id', str(pane_id), '--no-paste'],
         input=text.encode(),
         capture_output=True
     )
     time.sleep(0.1)
-    subprocess.run(
+    entered = subprocess.run(
         ['wezterm', 'cli', 'send-text', '--pane-id', str(pane_id), '--no-paste'],
         input=b'\r',
         capture_output=True
     )
+    return typed.returncode == 0 and entered.returncode == 0
+
+
+def pane_paste(pane_id, text):
+    """Deliver text in one shot with bracketed paste, then press Enter.
+
+    Returns True if every CLI call succeeded.
+    """
+    if get_session_backend() == "tmux":
+        buffer = f'solo-ops-{os.getpid()}-{threading.get_ident()}'
+        loaded = subprocess.run(
+            ['tmux', 'load-buffer', '-b', buffer, '-'],
+            input=text.encode(),
+            capture_output=True
+        )
+        if loaded.returncode != 0:
+            return False
+        pasted = subprocess.run(
+            ['tmux', 'paste-buffer', '-p', '-d', '-b', buffer, '-t', str(pane_id)],
+            capture_output=True
+        )
+        if pasted.returncode != 0:
+            subprocess.run(['tmux', 'delete-buffer', '-b', buffer], capture_output=True)
+            return False
+        time.sleep(0.1)
+        entered = subprocess.run(
+            ['tmux', 'send-keys', '-t', str(pane_id), 'Enter'],
+            capture_output=True
+        )
+        return entered.returncode == 0
+
+    # Without --no-paste, WezTerm wraps the text in bracketed paste
+    pasted = subprocess.run(
+        ['wezterm', 'cli', 'send-text', '--pane-id', str(pane_id)],
+        input=text.encode(),
+        capture_output=True
+    )
+    if pasted.returncode != 0:
+        return False
+    time.sleep(0.1)
+    entered = subprocess.run(
+        ['wezterm', 'cli', 'send-text', '--pane-id', str(pane_id), '--no-paste'],
+        input=b'\r',
+        capture_output=True
+    )
+    return entered.returncode == 0
+
+
+# ─── locking ─────────────────────────────────────────────────────────────────
+#
+# Advisory fcntl locks let independent invocations run in parallel: per-role
+# locks serialize open/assign/reply on one role, the repo lock is only taken
+# by create/delete/merge/doctor. Locks are re-entrant within a thread so e.g.
+# assign can call open while holding the role lock.
+
+_held_locks = threading.local()
+
+
+@contextmanager
+def file_lock(path):
+    held = _held_locks.__dict__.setdefault('paths', {})
+    key = str(path)
+    if key in held:
+        held[key] += 1
+        try:
+            yield
+        finally:
+            held[key] -= 1
+        return
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        held[key] = 1
+        try:
+            yield
+        finally:
+            del held[key]
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def role_lock(root, name):
+    return file_lock(state_dir(root) / 'locks' / f'role-{name}.lock')
+
+
+def repo_lock(root):
+    return file_lock(state_dir(root) / 'locks' / 'repo.lock')
+
+
+def pool_lock(root):
+    return file_lock(state_dir(root) / 'locks' / f'pool-{get_session_backend()}.lock')
+
+
+# ─── role context (CLAUDE.md) ────────────────────────────────────────────────
+#
+# Sections are emitted most-stable first so the provider's prompt-prefix cache
+# survives edits: shared team sections (identical for every role), then the
+# role's prompt.md, then the environment section (per role and checkout path).
+
+def shared_sections(root):
+    """Shared team sections: <root>/agents/shared/*.md, in filename order."""
+    shared_dir = Path(root, 'agents', 'shared')
+    if not shared_dir.is_dir():
+        return []
+    return [f.read_text() for f in sorted(shared_dir.glob('*.md')) if f.is_file()]
+
+
+def environment_section(root, wt_path, name):
+    """Git worktree context so the AI knows where and how to commit."""
+    return (
+        '## Development Environment\n\n'
+        'You are working in an **isolated git worktree**. All development MUST happen here:\n\n'
+        f'- **Working directory**: `{wt_path}`\n'
+        f'- **Git branch**: `team/{name}` (your dedicated branch)\n'
+        f'- **Main project root**: `{root}`\n\n'
+        '### Git Rules\n\n'
+        f'- All changes and commits go to the `team/{name}` branch — this is already checked out\n'
+        '- **Never** run `git checkout`, `git switch`, or change branches\n'
+        '- **Never** merge or rebase from within this worktree\n'
+        '- Commit regularly with clear messages as you complete work\n'
+        '- When your task is fully done, move its file from `tasks/pending/` to `tasks/done/`\n\n'
+        'The main controller will merge your branch back to main when ready.\n'
+    )
+
+
+def render_role_context(root, wt_path, name):
+    """Build the full CLAUDE.md text for a role, deterministically."""
+    sections = list(shared_sections(root))
+    prompt_md = Path(wt_path, 'agents', 'teams', name, 'prompt.md')
+    if prompt_md.is_file():
+        sections.append(prompt_md.read_text())
+    sections.append(environment_section(root, wt_path, name))
+    return '\n'.join(section.rstrip('\n') + '\n' for section in sections)
+
+
+def write_role_context(root, wt_path, name):
+    """Write CLAUDE.md only when its content hash changes.
+
+    Returns (path, changed, size_in_bytes).
+    """
+    claude_md = Path(wt_path, 'CLAUDE.md')
+    data = render_role_context(root, wt_path, name).encode()
+    digest = hashlib.sha256(data).hexdigest()
+    changed = True
+    if claude_md.is_file():
+        changed = hashlib.sha256(claude_md.read_bytes()).hexdigest() != digest
+    if changed:
+        claude_md.write_bytes(data)
+    return claude_md, changed, len(data)
+
+
+def report_role_context(path, changed, size):
+    state = 'updated' if changed else 'unchanged'
+    print(f"  {path.name} {state} ({size} bytes, ~{size // 4} tokens)")
+
+
+# ─── shell pool ──────────────────────────────────────────────────────────────
+#
+# Pre-spawned, already-initialized shells parked at the repo root. `open` claims
+# one, cd's it into the role worktree and launches the provider immediately,
+# instead of spawning a fresh shell and sleeping SHELL_WARMUP_SECONDS.
+
+def pool_size():
+    """Target pool size from SOLO_OPS_POOL_SIZE (0 = pool disabled)."""
+    try:
+        return max(0, int(os.environ.get('SOLO_OPS_POOL_SIZE', '0') or 0))
+    except ValueError:
+        return 0
+
+
+def pool_file(root):
+    return state_dir(root) / f'pool-{get_session_backend()}.txt'
+
+
+def pool_read(root):
+    """Return pool entries as (pane_id, spawned_at, fingerprint) tuples, oldest first."""
+    path = pool_file(root)
+    if not path.is_file():
+        return []
+    entries = []
+    for line in path.read_text().splitlines():
+        parts = line.split()
+        if len(parts) not in (2, 3):
+            continue
+        try:
+            entries.append((parts[0], float(parts[1]), parts[2] if len(parts) == 3 else ''))
+        except ValueError:
+            continue
+    return entries
+
+
+def pool_write(root, entries):
+    pool_file(root).write_text(''.join(f'{pane} {ts:.3f} {fp}\n' for pane, ts, fp in entries))
+
+
+def pool_live_entries(root, entries, panes):
+    """Keep only entries that still name one of our pool panes.
+
+    Pane ids are reused after a terminal/server restart, so a live id alone is
+    not enough: the pane must carry the pool title, sit in the repo root and
+    match the fingerprint recorded when it was spawned.
+    """
+    root_path = Path(root).resolve()
+    live = []
+    for pane_id, ts, fingerprint in entries:
+        pane = panes.get(pane_id)
+        if pane is None or pane['title'] != POOL_PANE_TITLE:
+            continue
+        if fingerprint and not fingerprints_match(fingerprint, pane['fingerprint']):
+            continue
+        if pane['cwd'] and Path(pane['cwd']).resolve() != root_path:
+            continue
+        live.append((pane_id, ts, fingerprint))
+    return live
+
+
+def pool_fill(root, size):
+    """Drop stale pool entries and spawn new panes until the pool holds `size` panes."""
+    with pool_lock(root):
+        return _pool_fill(root, size)
+
+
+def _pool_fill(root, size):
+    # Pool panes come and go outside any fleet snapshot, so always list live
+    entries = pool_live_entries(root, pool_read(root), pane_inventory(use_cache=False))
+    spawned = []
+    while len(entries) + len(spawned) < size:
+        pane_id = spawn_session(root, POOL_PANE_TITLE)
+        if not pane_id:
+            break
+        spawned.append((pane_id, time.time()))
+    if spawned:
+        panes = pane_inventory(use_cache=False)
+        entries += [(pane_id, ts, panes.get(pane_id, {}).get('fingerprint', ''))
+                    for pane_id, ts in spawned]
+    pool_write(root, entries)
+    return len(spawned)
+
+
+def pool_claim(root):
+    """Take the oldest live pool pane, waiting out any remaining warmup.
+
+    Returns '' when the pool is empty.
+    """
+    with pool_lock(root):
+        entries = pool_read(root)
+        if not entries:
+            return ''
+        entries = pool_live_entries(root, entries, pane_inventory(use_cache=False))
+        pool_write(root, entries[1:])
+    if not entries:
+        return ''
+    pane_id, spawned_at, _ = entries[0]
+    wait = SHELL_WARMUP_SECONDS - (time.time() - spawned_at)
+    if wait > 0:
+        time.sleep(wait)
+    return pane_id
+
+
+def pool_refill_async(root):
+    """Refill the pool from a detached child process so `open` returns immediately."""
+    env = {k: v for k, v in os.environ.items() if k != PANE_INVENTORY_ENV}
+    subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve()), 'pool', 'fill'],
+        cwd=root,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+# ─── message delivery ────────────────────────────────────────────────────────
+#
+# Short single-line messages are typed; longer or multi-line ones are pasted in
+# one shot; very large ones are spooled to a file and only a pointer is sent.
+# Messages for offline roles wait in a per-role outbox, flushed in order when
+# `open` brings the session back.
+
+def spool_message(root, text):
+    spool_dir = state_dir(root) / 'spool'
+    spool_dir.mkdir(exist_ok=True)
+    path = spool_dir / f"{datetime.now().strftime('%Y-%m-%d-%H-%M-%S')}-{secrets.token_hex(4)}.md"
+    path.write_text(text)
+    return path
+
+
+def stale_spool_files(root):
+    """Spooled messages older than SPOOL_MAX_AGE_DAYS, oldest first."""
+    spool_dir = state_dir(root) / 'spool'
+    if not spool_dir.is_dir():
+        return []
+    cutoff = time.time() - SPOOL_MAX_AGE_DAYS * 86400
+    return sorted(f for f in spool_dir.glob('*.md') if f.stat().st_mtime < cutoff)
+
+
+def deliver(root, pane_id, text):
+    """Send a message to a live pane using the cheapest safe transport for its size.
+
+    Returns True on success; on failure the caller should keep the message queued.
+    """
+    size = len(text.encode())
+    path = None
+    if size > SPOOL_THRESHOLD:
+        path = spool_message(root, text)
+        first_line = next((line for line in text.splitlines() if line.strip()), '')
+        text = f'{first_line[:120]} … [full message ({size} bytes): {path}]'
+    if '\n' in text or len(text) > PASTE_THRESHOLD:
+        sent = pane_paste(pane_id, text)
+    else:
+        sent = pane_send(pane_id, text)
+    if not sent and path is not None:
+        path.unlink()
+    return sent
+
+
+def outbox_dir(root, name):
+    return state_dir(root) / 'outbox' / name
+
+
+def outbox_pending(root, name):
+    path = outbox_dir(root, name)
+    return sorted(path.glob('*.msg')) if path.is_dir() else []
+
+
+def outbox_put(root, name, text):
+    """Queue a message for an offline role. Returns the number of queued messages."""
+    path = outbox_dir(root, name)
+    path.mkdir(parents=True, exist_ok=True)
+    msg = path / f'{time.time_ns():020d}-{secrets.token_hex(2)}.msg'
+    tmp = msg.with_suffix('.tmp')
+    tmp.write_text(text)
+    os.replace(tmp, msg)
+    return len(outbox_pending(root, name))
+
+
+def outbox_flush(root, name, pane_id):
+    """Deliver queued messages in order, removing each once sent. Returns the count.
+
+    Stops at the first failed delivery so the rest stay queued, in order.
+    """
+    sent = 0
+    for msg in outbox_pending(root, name):
+        if not deliver(root, pane_id, msg.read_text()):
+            break
+        msg.unlink()
+        sent += 1
+    return sent
+
+
+def deliver_in_order(root, name, pane_id, text):
+    """Flush the outbox, then deliver text; queue text if anything is left undelivered.
+
+    Returns True if text reached the pane.
+    """
+    report_outbox_flush(root, name, pane_id)
+    if not outbox_pending(root, name) and deliver(root, pane_id, text):
+        return True
+    queued = outbox_put(root, name, text)
+    print(f"Warning: could not deliver to '{name}' (pane {pane_id}); "
+          f"message queued ({queued} in outbox)", file=sys.stderr)
+    return False
+
+
+def report_outbox_flush(root, name, pane_id):
+    sent = outbox_flush(root, name, pane_id)
+    if sent:
+        print(f"✓ Delivered {sent} queued message(s) to '{name}'")
+
+
+# ─── task archive ────────────────────────────────────────────────────────────
+#
+# Completed tasks are packed into tasks/archive/<YYYY-MM>.zip (one deflated
+# member per task, so a single task is read without unpacking the rest) with
+# tasks/archive/index.json mapping task file stem -> archive, member and slug.
+
+def task_slug(filename):
+    """Everything after the timestamp ('<hex>-<slug>' or a legacy '<slug>'), else the stem."""
+    match = TASK_NAME_RE.match(filename)
+    return match.group(2) if match else Path(filename).stem
+
+
+def slug_matches(slug, key):
+    """True if key is the stored slug, or the slug without a leading '<4 hex>-' id suffix."""
+    if slug == key:
+        return True
+    return bool(re.match(r'^[0-9a-f]{4}-', slug)) and slug[5:] == key
+
+
+def archive_index_read(archive_dir):
+    path = Path(archive_dir, 'index.json')
+    if not path.is_file():
+        return {}
+    return json.loads(path.read_text())
+
+
+def archive_index_write(archive_dir, index):
+    path = Path(archive_dir, 'index.json')
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(index, sort_keys=True, separators=(',', ':')) + '\n')
+    os.replace(tmp, path)
+
+
+def archive_role(teams_dir, older_than_days=ARCHIVE_DAYS):
+    """Pack done tasks older than `older_than_days` into monthly archives. Returns the count.
+
+    Safe to re-run after an interruption: members already in an archive are
+    not written twice, and source files are removed only after the index is saved.
+    """
+    done_dir = Path(teams_dir, 'tasks', 'done')
+    if not done_dir.is_dir():
+        return 0
+    cutoff = time.time() - older_than_days * 86400
+    by_month = {}
+    for task in sorted(done_dir.glob('*.md')):
+        mtime = task.stat().st_mtime
+        if mtime > cutoff:
+            continue
+        match = TASK_NAME_RE.match(task.name)
+        month = match.group(1)[:7] if match else datetime.fromtimestamp(mtime).strftime('%Y-%m')
+        by_month.setdefault(month, []).append(task)
+    if not by_month:
+        return 0
+
+    archive_dir = Path(teams_dir, 'tasks', 'archive')
+    archive_dir.mkdir(exist_ok=True)
+    index = archive_index_read(archive_dir)
+    packed = []
+    for month, tasks in sorted(by_month.items()):
+        archive = f'{month}.zip'
+        with zipfile.ZipFile(archive_dir / archive, 'a', compression=zipfile.ZIP_DEFLATED) as zf:
+            existing = set(zf.namelist())
+            for task in tasks:
+                if task.name not in existing:
+                    zf.write(task, task.name)
+                # The file stem is unique within done/, unlike the timestamp
+                index[task.stem] = {'archive': archive, 'file': task.name, 'slug': task_slug(task.name)}
+                packed.append(task)
+    archive_index_write(archive_dir, index)
+    for task in packed:
+        task.unlink()
+    return len(packed)
+
+
+def archive_lookup(teams_dir, key):
+    """Find archived tasks by file stem, task id (stem prefix), slug, or slug substring.
+
+    Returns [(stem, entry)]; several entries mean the key is ambiguous.
+    """
+    index = archive_index_read(Path(teams_dir, 'tasks', 'archive'))
+    if key in index:
+        return [(key, index[key])]
+    for matches in (
+        [(stem, e) for stem, e in sorted(index.items()) if stem.startswith(key + '-')],
+        [(stem, e) for stem, e in sorted(index.items()) if slug_matches(e['slug'], key)],
+        [(stem, e) for stem, e in sorted(index.items()) if key in e['slug']],
+    ):
+        if matches:
+            return matches
+    return []
+
+
+def archive_read(teams_dir, entry):
+    archive = Path(teams_dir, 'tasks', 'archive', entry['archive'])
+    with zipfile.ZipFile(archive) as zf:
+        return zf.read(entry['file']).decode()
+
+
+def archive_if_over_threshold(teams_dir):
+    """Auto-archive when tasks/done holds more than SOLO_OPS_ARCHIVE_THRESHOLD files."""
+    try:
+        threshold = int(os.environ.get('SOLO_OPS_ARCHIVE_THRESHOLD', '0') or 0)
+    except ValueError:
+        return 0
+    done_dir = Path(teams_dir, 'tasks', 'done')
+    if threshold <= 0 or not done_dir.is_dir():
+        return 0
+    if sum(1 for _ in done_dir.glob('*.md')) <= threshold:
+        return 0
+    return archive_role(teams_dir)
+
+
+# ─── fleet ───────────────────────────────────────────────────────────────────
+#
+# A registry of repository roots (one path per line) lets status, open-all and
+# assign run across many repos at once. All repos share one terminal server, so
+# the pane listing is taken once and reused.
+
+def fleet_registry():
+    """Registry file: $SOLO_OPS_FLEET, else ~/.config/solo-ops/fleet."""
+    override = os.environ.get('SOLO_OPS_FLEET', '')
+    if override:
+        return Path(override).expanduser()
+    return Path.home() / '.config' / 'solo-ops' / 'fleet'
+
+
+def fleet_repos():
+    path = fleet_registry()
+    if not path.is_file():
+        return []
+    repos = []
+    for line in path.read_text().splitlines():
+        line = line.strip()
+        if line and not line.startswith('#') and line not in repos:
+            repos.append(line)
+    return repos
+
+
+def fleet_save(repos):
+    path = fleet_registry()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with file_lock(path.with_name(path.name + '.lock')):
+        path.write_text(''.join(f'{repo}\n' for repo in repos))
+
+
+def fleet_run(repos, args, panes):
+    """Run this script with args in every repo concurrently.
+
+    Returns [(repo, returncode, output)] in registry order.
+    """
+    env = dict(os.environ)
+    env[PANE_INVENTORY_ENV] = json.dumps(panes)
+    script = str(Path(__file__).resolve())
+
+    def run(repo):
+        result = subprocess.run(
+            [sys.executable, script, *args],
+            cwd=repo, env=env, capture_output=True, text=True
+        )
+        return repo, result.returncode, (result.stdout + result.stderr).rstrip()
+
+    with ThreadPoolExecutor(max_workers=git_workers(len(repos))) as pool:
+        return list(pool.map(run, repos))
 
 
 # ─── commands ────────────────────────────────────────────────────────────────
@@ -191,13 +1110,14 @@ def cmd_create(name):
     wt_path = Path(root, wt_base, name)
     branch = f'team/{name}'
 
-    if wt_path.is_dir():
-        print(f"Error: role '{name}' already exists at {wt_path}", file=sys.stderr)
-        sys.exit(1)
+    with repo_lock(root):
+        if wt_path.is_dir():
+            print(f"Error: role '{name}' already exists at {wt_path}", file=sys.stderr)
+            sys.exit(1)
 
-    print(f"Creating role '{name}'...")
-    subprocess.run(['git', 'worktree', 'add', str(wt_path), '-b', branch],
-                   cwd=root, check=True)
+        print(f"Creating role '{name}'...")
+        subprocess.run(['git', 'worktree', 'add', str(wt_path), '-b', branch],
+                       cwd=root, check=True)
 
     teams_dir = wt_path / 'agents' / 'teams' / name
     (teams_dir / 'tasks' / 'pending').mkdir(parents=True)
@@ -211,6 +1131,7 @@ def cmd_create(name):
         f'default_model: ""\n'
         f'created_at: {now}\n'
         f'pane_id: ""\n'
+        f'pane_fingerprint: ""\n'
     )
 
     (teams_dir / 'prompt.md').write_text(
@@ -247,44 +1168,40 @@ def cmd_delete(name):
     wt_path = Path(root, wt_base, name)
     config = wt_path / 'agents' / 'teams' / name / 'config.yaml'
 
-    if not wt_path.is_dir():
-        print(f"Error: role '{name}' not found", file=sys.stderr)
-        sys.exit(1)
+    with repo_lock(root), role_lock(root, name):
+        if not wt_path.is_dir():
+            print(f"Error: role '{name}' not found", file=sys.stderr)
+            sys.exit(1)
 
-    print(f"Deleting role '{name}'...")
-    pane_id = cfg_get(str(config), 'pane_id')
-    if pane_alive(pane_id):
-        if get_session_backend() == "tmux":
-            close_result = subprocess.run(
-                ['tmux', 'kill-pane', '-t', str(pane_id)],
-                capture_output=True
-            )
-        else:
-            close_result = subprocess.run(
-                ['wezterm', 'cli', 'kill-pane', '--pane-id', str(pane_id)],
-                capture_output=True
-            )
-        if close_result.returncode != 0:
-            print(
-                f"Warning: failed to close pane {pane_id}; continuing delete",
-                file=sys.stderr
-            )
+        print(f"Deleting role '{name}'...")
+        pane_id = cfg_get(str(config), 'pane_id')
+        if cfg_get(str(config), 'pane_fingerprint'):
+            pane_id = role_pane(config)
+        if pane_alive(pane_id):
+            if not pane_kill(pane_id):
+                print(
+                    f"Warning: failed to close pane {pane_id}; continuing delete",
+                    file=sys.stderr
+                )
 
-    result = subprocess.run(
-        ['git', 'worktree', 'remove', str(wt_path), '--force'],
-        cwd=root, capture_output=True
-    )
-    if result.returncode != 0:
-        import shutil
-        try:
-            shutil.rmtree(wt_path)
-        except FileNotFoundError:
-            # git worktree remove may have already deleted the directory
-            pass
+        result = subprocess.run(
+            ['git', 'worktree', 'remove', str(wt_path), '--force'],
+            cwd=root, capture_output=True
+        )
+        if result.returncode != 0:
+            try:
+                shutil.rmtree(wt_path)
+            except FileNotFoundError:
+                # git worktree remove may have already deleted the directory
+                pass
+            # Drop the now-dangling registration so it doesn't linger as an orphan
+            subprocess.run(['git', 'worktree', 'prune'], cwd=root, capture_output=True)
 
-    subprocess.run(['git', 'branch', '-D', f'team/{name}'],
-                   cwd=root, capture_output=True)
-    print(f"✓ Deleted role '{name}'")
+        subprocess.run(['git', 'branch', '-D', f'team/{name}'],
+                       cwd=root, capture_output=True)
+        # Queued messages were meant for this role, not a future one with its name
+        shutil.rmtree(outbox_dir(root, name), ignore_errors=True)
+        print(f"✓ Deleted role '{name}'")
 
 
 def cmd_open(name, provider='', model=''):
@@ -305,85 +1222,49 @@ def cmd_open(name, provider='', model=''):
     if not provider:
         provider = cfg_get(str(config), 'default_provider') or 'claude'
 
-    pane_id = cfg_get(str(config), 'pane_id')
-    if pane_alive(pane_id):
-        print(f"Role '{name}' is already running (pane {pane_id})")
-        return
-
-    # Generate CLAUDE.md from prompt.md so the AI reads the role on startup
-    prompt_md = teams_dir / 'prompt.md'
-    claude_md = wt_path / 'CLAUDE.md'
-    if prompt_md.exists():
-        claude_md.write_text(prompt_md.read_text())
-
-    # Append git worktree context so the AI knows where and how to commit
-    with open(claude_md, 'a') as f:
-        f.write(
-            '\n## Development Environment\n\n'
-            'You are working in an **isolated git worktree**. All development MUST happen here:\n\n'
-            f'- **Working directory**: `{wt_path}`\n'
-            f'- **Git branch**: `team/{name}` (your dedicated branch)\n'
-            f'- **Main project root**: `{root}`\n\n'
-            '### Git Rules\n\n'
-            f'- All changes and commits go to the `team/{name}` branch — this is already checked out\n'
-            '- **Never** run `git checkout`, `git switch`, or change branches\n'
-            '- **Never** merge or rebase from within this worktree\n'
-            '- Commit regularly with clear messages as you complete work\n'
-            '- When your task is fully done, move its file from `tasks/pending/` to `tasks/done/`\n\n'
-            'The main controller will merge your branch back to main when ready.\n'
-        )
-
-    launch_cmd = build_launch_cmd(provider, model)
-
-    backend = get_session_backend()
-    current_pane = os.environ.get('WEZTERM_PANE', '')
-
-    if backend == "tmux":
-        result = subprocess.run(
-            ['tmux', 'new-session', '-d', '-P', '-F', '#{pane_id}', '-c', str(wt_path)],
-            capture_output=True, text=True
-        )
-    else:
-        # Spawn a new tab with an interactive shell (no command = WezTerm opens default shell)
-        # This avoids the issue where `zsh -c "claude"` causes TUI apps to exit immediately
-        result = subprocess.run(
-            ['wezterm', 'cli', 'spawn', '--cwd', str(wt_path)],
-            capture_output=True, text=True
-        )
-
-    if result.returncode != 0 or not result.stdout.strip():
-        print(f"✗ Failed to open {backend} session for '{name}'", file=sys.stderr)
-        sys.exit(1)
-
-    new_pane_id = result.stdout.strip()
-
-    if backend == "tmux":
-        subprocess.run(
-            ['tmux', 'rename-window', '-t', str(new_pane_id), name],
-            capture_output=True
-        )
-    else:
-        # Set tab title
-        subprocess.run(
-            ['wezterm', 'cli', 'set-tab-title', '--pane-id', new_pane_id, name],
-            capture_output=True
-        )
+    with role_lock(root, name):
+        pane_id = role_pane(config)
+        if pane_id:
+            print(f"Role '{name}' is already running (pane {pane_id})")
+            report_outbox_flush(root, name, pane_id)
+            return
+
+        # Render CLAUDE.md so the AI reads the role on startup (rewritten only when content changed)
+        report_role_context(*write_role_context(root, wt_path, name))
+
+        launch_cmd = build_launch_cmd(provider, model)
+        backend = get_session_backend()
+
+        new_pane_id = pool_claim(root) if pool_size() else ''
+        if new_pane_id:
+            # Pooled shell is already initialized: move it into the worktree and launch right away
+            pane_send(new_pane_id, f'cd {shlex.quote(str(wt_path))} && clear')
+            pane_set_title(new_pane_id, name)
+            record_pane(config, new_pane_id)
+            pane_send(new_pane_id, launch_cmd)
+            print(f"✓ Opened role '{name}' ({provider}) in {backend} [pane {new_pane_id}, pooled]")
+        else:
+            new_pane_id = spawn_session(wt_path, name)
+            if not new_pane_id:
+                print(f"✗ Failed to open {backend} session for '{name}'", file=sys.stderr)
+                sys.exit(1)
 
-        # Return focus to the caller's pane — don't steal focus
-        if current_pane:
-            subprocess.run(
-                ['wezterm', 'cli', 'activate-pane', '--pane-id', current_pane],
-                capture_output=True
-            )
+            record_pane(config, new_pane_id)
 
-    cfg_set(str(config), 'pane_id', new_pane_id)
+            # Wait for the interactive shell to fully initialize (zsh + plugins), then launch AI
+            print("  Waiting for shell to initialize...")
+            time.sleep(SHELL_WARMUP_SECONDS)
+            pane_send(new_pane_id, launch_cmd)
 
-    # Wait for the interactive shell to fully initialize (zsh + plugins), then launch AI
-    print("  Waiting for shell to initialize...")
-    time.sleep(2)
-    pane_send(new_pane_id, launch_cmd)
+            print(f"✓ Opened role '{name}' ({provider}) in {backend} [pane {new_pane_id}]")
+        if pool_size():
+            pool_refill_async(root)
 
-    print(f"✓ Opened role '{name}' ({provider}) in {backend} [pane {new_pane_id}]")
+        # Deliver messages that arrived while the role was offline
+        if outbox_pending(root, name):
+            print("  Waiting for AI to initialize...")
+            time.sleep(AI_WARMUP_SECONDS)
+            report_outbox_flush(root, name, new_pane_id)
 
 
 def cmd_open_all(provider='', model=''):
@@ -412,9 +1293,8 @@ def cmd_assign(name, task, provider='', model=''):
         print(f"Error: role '{name}' not found", file=sys.stderr)
         sys.exit(1)
 
-    ts = datetime.now().strftime('%Y-%m-%d-%H-%M-%S')
     slug = re.sub(r'[^a-z0-9]+', '-', task.lower()).strip('-')[:50] or 'task'
-    task_file = teams_dir / 'tasks' / 'pending' / f'{ts}-{slug}.md'
+    task_file = new_task_file(teams_dir / 'tasks' / 'pending', slug)
 
     now_utc = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
     task_file.write_text(
@@ -428,41 +1308,87 @@ def cmd_assign(name, task, provider='', model=''):
     )
     print(f"✓ Task file: {task_file}")
 
-    pane_id = cfg_get(str(config), 'pane_id')
-    if not pane_alive(pane_id):
-        print(f"Role '{name}' is not running, opening session first...")
-        cmd_open(name, provider, model)
-        pane_id = cfg_get(str(config), 'pane_id')
-        print("  Waiting for AI to initialize...")
-        time.sleep(3)
-
     task_rel = f'agents/teams/{name}/tasks/pending/{task_file.name}'
     msg = (
         f'New task assigned: {task}\n'
         f'Please read the task file at: {task_rel}\n'
         f'When complete, move it to agents/teams/{name}/tasks/done/'
     )
-    pane_send(pane_id, msg)
+
+    with role_lock(root, name):
+        pane_id = role_pane(config)
+        if not pane_id:
+            print(f"Role '{name}' is not running, opening session first...")
+            cmd_open(name, provider, model)
+            pane_id = cfg_get(str(config), 'pane_id')
+            print("  Waiting for AI to initialize...")
+            time.sleep(AI_WARMUP_SECONDS)
+        # Older queued messages go first so the role sees everything in order
+        deliver_in_order(root, name, pane_id, msg)
+        archived = archive_if_over_threshold(teams_dir)
     print(f"✓ Assigned to '{name}': {task}")
+    if archived:
+        print(f"✓ Archived {archived} completed task(s) for '{name}'")
 
 
-def cmd_status():
-    root = find_git_root()
+def collect_status(root, panes, progress=False):
+    """Status of every role in root. Returns (base_branch, rows).
+
+    Each row has role, pane_id ('' when offline) and pending; with progress
+    also ahead, behind, last_commit and diffstat relative to base_branch.
+    """
     wt_base = find_wt_base(root)
     roles = list_roles(root, wt_base)
-    if not roles:
+    base = current_branch(root) if progress else ''
+    stats = branch_progress(root, base, roles) if progress and roles else {}
+    rows = []
+    for role in roles:
+        teams_dir = Path(root, wt_base, role, 'agents', 'teams', role)
+        pending_dir = teams_dir / 'tasks' / 'pending'
+        row = {
+            'role': role,
+            'pane_id': role_pane(teams_dir / 'config.yaml', panes),
+            'pending': len(list(pending_dir.glob('*.md'))) if pending_dir.is_dir() else 0,
+        }
+        if progress:
+            row.update(stats.get(role, {'ahead': '?', 'behind': '?', 'last_commit': '-', 'diffstat': '-'}))
+        rows.append(row)
+    return base, rows
+
+
+def print_status_rows(rows, progress=False, repo_width=0):
+    """Print status rows as a table; repo_width > 0 adds a leading Repo column."""
+    repo_head = f"{'Repo':<{repo_width}} " if repo_width else ''
+    repo_rule = f"{'─' * repo_width} " if repo_width else ''
+    if progress:
+        print(f"{repo_head}{'Role':<16} {'Status':<24} {'Pending':<8} {'Ahead/Behind':<13} "
+              f"{'Last Commit':<20} {'Changes'}")
+        print(f"{repo_rule}{'─' * 16} {'─' * 24} {'─' * 8} {'─' * 13} {'─' * 20} {'─' * 14}")
+    else:
+        print(f"{repo_head}{'Role':<16} {'Status':<24} {'Pending Tasks'}")
+        print(f"{repo_rule}{'─' * 16} {'─' * 24} {'─' * 13}")
+    for row in rows:
+        repo = f"{row.get('repo', ''):<{repo_width}} " if repo_width else ''
+        pane_id = row['pane_id']
+        status = f'✓ running [p:{pane_id}]' if pane_id else '✗ offline'
+        if progress:
+            ahead_behind = f"+{row['ahead']}/-{row['behind']}"
+            print(f"{repo}{row['role']:<16} {status:<24} {row['pending']:<8} {ahead_behind:<13} "
+                  f"{row['last_commit']:<20} {row['diffstat']}")
+        else:
+            print(f"{repo}{row['role']:<16} {status:<24} {row['pending']}")
+
+
+def cmd_status(progress=False):
+    root = find_git_root()
+    base, rows = collect_status(root, pane_inventory(), progress)
+    if not rows:
         print("No roles found. Create one with: solo-ops create <name>")
         return
 
-    print(f"{'Role':<16} {'Status':<24} {'Pending Tasks'}")
-    print(f"{'─' * 16} {'─' * 24} {'─' * 13}")
-    for role in roles:
-        config = Path(root, wt_base, role, 'agents', 'teams', role, 'config.yaml')
-        pending_dir = Path(root, wt_base, role, 'agents', 'teams', role, 'tasks', 'pending')
-        pane_id = cfg_get(str(config), 'pane_id')
-        status = f'✓ running [p:{pane_id}]' if pane_alive(pane_id) else '✗ offline'
-        count = len(list(pending_dir.glob('*.md'))) if pending_dir.is_dir() else 0
-        print(f"{role:<16} {status:<24} {count}")
+    if progress:
+        print(f"Progress relative to '{base}'\n")
+    print_status_rows(rows, progress)
 
 
 def cmd_reply(name, answer):
@@ -478,13 +1404,17 @@ def cmd_reply(name, answer):
         print(f"Error: role '{name}' not found", file=sys.stderr)
         sys.exit(1)
 
-    pane_id = cfg_get(str(config), 'pane_id')
-    if not pane_alive(pane_id):
-        print(f"Error: role '{name}' is not running", file=sys.stderr)
-        sys.exit(1)
+    with role_lock(root, name):
+        message = f'[Main Controller Reply] {answer}'
+        pane_id = role_pane(config)
+        if not pane_id:
+            queued = outbox_put(root, name, message)
+            print(f"Role '{name}' is offline; reply queued ({queued} in outbox), "
+                  "delivered on next open")
+            return
 
-    pane_send(pane_id, f'[Main Controller Reply] {answer}')
-    print(f"✓ Replied to '{name}'")
+        if deliver_in_order(root, name, pane_id, message):
+            print(f"✓ Replied to '{name}'")
 
 
 def cmd_merge(name):
@@ -497,24 +1427,376 @@ def cmd_merge(name):
     wt_path = Path(root, wt_base, name)
     branch = f'team/{name}'
 
-    if not wt_path.is_dir():
-        print(f"Error: role '{name}' not found", file=sys.stderr)
+    with repo_lock(root):
+        if not wt_path.is_dir():
+            print(f"Error: role '{name}' not found", file=sys.stderr)
+            sys.exit(1)
+
+        main_branch = current_branch(root)
+
+        print(f"Merging branch '{branch}' into '{main_branch}'...")
+        subprocess.run(
+            ['git', 'merge', branch, '--no-ff', '-m',
+             f"merge: integrate work from team role '{name}'"],
+            cwd=root, check=True
+        )
+        print(f"✓ Merged '{name}' into {main_branch}")
+        print(f"  → Run 'solo-ops delete {name}' to remove the worktree when done")
+
+
+def cmd_doctor(dry_run=False):
+    """Reconcile worktree registrations, team/* branches, role dirs and pane ids in bulk."""
+    root = find_git_root()
+    wt_base = find_wt_base(root)
+    base = Path(root, wt_base)
+
+    with repo_lock(root):
+        worktrees = team_worktrees(root)
+        branches = set(team_branches(root))
+        panes = pane_inventory()
+        problems = 0
+        fixed = 0
+
+        def report(msg, fix=''):
+            nonlocal problems
+            problems += 1
+            print(f"✗ {msg}")
+            if fix:
+                print(f"  → {fix}")
+
+        prunable = sorted(name for name, wt in worktrees.items() if wt['prunable'])
+        for name in prunable:
+            report(f"worktree for 'team/{name}' is registered but its directory is gone: "
+                   f"{worktrees[name]['path']}")
+        if prunable and not dry_run:
+            subprocess.run(['git', 'worktree', 'prune'], cwd=root, capture_output=True)
+            print(f"  ✓ pruned {len(prunable)} orphaned worktree registration(s)")
+            fixed += len(prunable)
+
+        for name in sorted(branches - set(worktrees)):
+            report(f"branch 'team/{name}' has no worktree",
+                   f"recreate with 'git worktree add {base / name} team/{name}' "
+                   f"or remove with 'git branch -D team/{name}'")
+
+        if base.is_dir():
+            for d in sorted(base.iterdir()):
+                if not d.is_dir() or not Path(d, 'agents', 'teams', d.name, 'config.yaml').is_file():
+                    continue
+                wt = worktrees.get(d.name)
+                if wt is None or Path(wt['path']).resolve() != d.resolve():
+                    report(f"role directory {d} is not a registered 'team/{d.name}' worktree",
+                           "inspect it, then remove it or re-create the role")
+
+        for name, wt in sorted(worktrees.items()):
+            if wt['prunable']:
+                continue
+            config = Path(wt['path'], 'agents', 'teams', name, 'config.yaml')
+            if not config.is_file():
+                report(f"worktree {wt['path']} on 'team/{name}' has no {config.name}")
+                continue
+            pane_id = cfg_get(str(config), 'pane_id')
+            if pane_id and not role_pane(config, panes):
+                report(f"role '{name}' has stale pane_id {pane_id}")
+                if not dry_run:
+                    record_pane(config, '', panes)
+                    print("  ✓ cleared pane_id")
+                    fixed += 1
+
+        stale = stale_spool_files(root)
+        if stale:
+            report(f"{len(stale)} spooled message(s) older than {SPOOL_MAX_AGE_DAYS} days "
+                   f"in {stale[0].parent}")
+            if not dry_run:
+                for f in stale:
+                    f.unlink()
+                print(f"  ✓ removed {len(stale)} spooled message(s)")
+                fixed += 1
+
+        if not problems:
+            print("✓ No problems found")
+        elif dry_run:
+            print(f"\n{problems} problem(s) found (dry run, nothing changed)")
+        else:
+            print(f"\n{problems} problem(s) found, {fixed} fixed")
+
+
+def match_panes(role_paths, panes, root=''):
+    """Match live panes back to roles. Returns {role: pane_id}.
+
+    A pane scores 2 when its cwd is inside the role worktree and 1 when its
+    tab/window title equals the role name; the best-scoring pairs win and
+    each pane is assigned to at most one role. A title alone only counts when
+    the pane's cwd is unknown or inside root, since repos sharing one terminal
+    server often reuse role names.
+    """
+    root_path = Path(root).resolve() if root else None
+    candidates = []
+    for role, wt_path in role_paths.items():
+        wt_path = Path(wt_path).resolve()
+        for pane_id, pane in panes.items():
+            cwd = Path(pane['cwd']).resolve() if pane['cwd'] else None
+            in_worktree = cwd is not None and (cwd == wt_path or wt_path in cwd.parents)
+            in_repo = cwd is None or (root_path is not None and (cwd == root_path or root_path in cwd.parents))
+            score = 0
+            if in_worktree:
+                score += 2
+            if pane['title'] == role and (in_worktree or in_repo):
+                score += 1
+            if score:
+                candidates.append((score, role, pane_id))
+
+    matched = {}
+    taken = set()
+    for score, role, pane_id in sorted(candidates, key=lambda c: -c[0]):
+        if role in matched or pane_id in taken:
+            continue
+        matched[role] = pane_id
+        taken.add(pane_id)
+    return matched
+
+
+def cmd_adopt(open_missing=True, provider='', model=''):
+    """Re-attach roles to their panes after a terminal/multiplexer restart."""
+    root = find_git_root()
+    wt_base = find_wt_base(root)
+    roles = list_roles(root, wt_base)
+    if not roles:
+        print("No roles found. Create one with: solo-ops create <name>")
+        return
+
+    panes = pane_inventory()
+    configs = {role: Path(root, wt_base, role, 'agents', 'teams', role, 'config.yaml') for role in roles}
+
+    # Roles whose recorded pane (and fingerprint) still check out keep it
+    current = {role: role_pane(config, panes) for role, config in configs.items()}
+    kept = {role: pane for role, pane in current.items() if pane}
+    free = {pane_id: pane for pane_id, pane in panes.items() if pane_id not in kept.values()}
+    unmatched = {role: Path(root, wt_base, role) for role in roles if role not in kept}
+    adopted = match_panes(unmatched, free, root)
+
+    missing = []
+    print(f"{'Role':<16} {'Pane':<10} {'Result'}")
+    print(f"{'─' * 16} {'─' * 10} {'─' * 10}")
+    for role in roles:
+        with role_lock(root, role):
+            if role in kept:
+                pane_id, result = kept[role], 'kept'
+            elif role in adopted:
+                pane_id, result = adopted[role], 'adopted'
+            else:
+                pane_id, result = '', 'missing'
+                missing.append(role)
+            record_pane(configs[role], pane_id, panes)
+            print(f"{role:<16} {pane_id or '-':<10} {result}")
+            if pane_id:
+                report_outbox_flush(root, role, pane_id)
+
+    if missing and open_missing:
+        print(f"\nRelaunching {len(missing)} missing role(s)...")
+        for role in missing:
+            cmd_open(role, provider, model)
+
+
+def cmd_context(name=''):
+    root = find_git_root()
+    wt_base = find_wt_base(root)
+    roles = [name] if name else list_roles(root, wt_base)
+    if not roles:
+        print("No roles found. Create one with: solo-ops create <name>")
+        return
+
+    for role in roles:
+        wt_path = Path(root, wt_base, role)
+        if not Path(wt_path, 'agents', 'teams', role).is_dir():
+            print(f"Error: role '{role}' not found", file=sys.stderr)
+            sys.exit(1)
+        print(f"{role}:")
+        with role_lock(root, role):
+            report_role_context(*write_role_context(root, wt_path, role))
+
+
+def cmd_pool(action, count=''):
+    root = find_git_root()
+
+    if action == 'fill':
+        try:
+            size = int(count) if count else pool_size()
+        except ValueError:
+            print(f"Error: invalid pool size: {count}", file=sys.stderr)
+            sys.exit(1)
+        if size <= 0:
+            print("Error: pool size is 0. Pass a size or set SOLO_OPS_POOL_SIZE", file=sys.stderr)
+            sys.exit(1)
+        spawned = pool_fill(root, size)
+        print(f"✓ Pool filled: {len(pool_read(root))} pane(s) ready ({spawned} spawned)")
+    elif action == 'status':
+        entries = pool_read(root)
+        if not entries:
+            print("Pool is empty")
+            return
+        live = pool_live_entries(root, entries, pane_inventory(use_cache=False))
+        now = time.time()
+        print(f"{'Pane':<10} {'Age':<8} {'State'}")
+        print(f"{'─' * 10} {'─' * 8} {'─' * 8}")
+        for entry in entries:
+            pane, ts, _ = entry
+            state = 'ready' if entry in live else 'stale'
+            print(f"{pane:<10} {int(now - ts):>6}s  {state}")
+    elif action == 'drain':
+        with pool_lock(root):
+            entries = pool_live_entries(root, pool_read(root), pane_inventory(use_cache=False))
+            for pane, _, _ in entries:
+                pane_kill(pane)
+            pool_write(root, [])
+        print(f"✓ Drained pool ({len(entries)} pane(s))")
+    else:
+        print("Usage: solo-ops pool fill [size] | status | drain", file=sys.stderr)
         sys.exit(1)
 
-    result = subprocess.run(
-        ['git', 'symbolic-ref', '--short', 'HEAD'],
-        cwd=root, capture_output=True, text=True
-    )
-    main_branch = result.stdout.strip() if result.returncode == 0 else 'main'
 
-    print(f"Merging branch '{branch}' into '{main_branch}'...")
-    subprocess.run(
-        ['git', 'merge', branch, '--no-ff', '-m',
-         f"merge: integrate work from team role '{name}'"],
-        cwd=root, check=True
-    )
-    print(f"✓ Merged '{name}' into {main_branch}")
-    print(f"  → Run 'solo-ops delete {name}' to remove the worktree when done")
+def cmd_fleet(action, args):
+    if action == 'add':
+        target = args[0] if args else os.getcwd()
+        result = subprocess.run(
+            ['git', '-C', target, 'rev-parse', '--show-toplevel'],
+            capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            print(f"Error: not a git repository: {target}", file=sys.stderr)
+            sys.exit(1)
+        repo = result.stdout.strip()
+        repos = fleet_repos()
+        if repo not in repos:
+            fleet_save(repos + [repo])
+        print(f"✓ Fleet: {repo}")
+        return
+
+    if action == 'remove':
+        if not args:
+            print("Usage: solo-ops fleet remove <path>", file=sys.stderr)
+            sys.exit(1)
+        target = str(Path(args[0]).expanduser().resolve())
+        repos = fleet_repos()
+        if target not in repos:
+            print(f"Error: {target} is not in the fleet", file=sys.stderr)
+            sys.exit(1)
+        fleet_save([repo for repo in repos if repo != target])
+        print(f"✓ Removed from fleet: {target}")
+        return
+
+    repos = fleet_repos()
+    if action == 'list':
+        if not repos:
+            print(f"Fleet is empty ({fleet_registry()}). Add repos with: solo-ops fleet add [path]")
+        for repo in repos:
+            print(f"{repo}{'' if Path(repo).is_dir() else '  (missing)'}")
+        return
+    if action not in ('status', 'open-all', 'assign'):
+        print('Usage: solo-ops fleet add [path] | remove <path> | list | status [--progress]\n'
+              '       solo-ops fleet open-all [provider] [--model <m>]\n'
+              '       solo-ops fleet assign <name> "<task>" [provider] [--model <m>]', file=sys.stderr)
+        sys.exit(1)
+
+    missing = [repo for repo in repos if not Path(repo).is_dir()]
+    for repo in missing:
+        print(f"Warning: fleet repo not found: {repo}", file=sys.stderr)
+    repos = [repo for repo in repos if repo not in missing]
+    if not repos:
+        print("Fleet is empty. Add repos with: solo-ops fleet add [path]", file=sys.stderr)
+        sys.exit(1)
+
+    panes = pane_inventory()
+
+    if action == 'status':
+        progress = '--progress' in args
+
+        def collect(repo):
+            return repo, collect_status(repo, panes, progress)[1]
+
+        with ThreadPoolExecutor(max_workers=git_workers(len(repos))) as pool:
+            results = list(pool.map(collect, repos))
+        rows = []
+        for repo, repo_rows in results:
+            for row in repo_rows:
+                row['repo'] = Path(repo).name
+                rows.append(row)
+        if not rows:
+            print("No roles found in any fleet repo")
+            return
+        width = max(16, max(len(row['repo']) for row in rows))
+        print_status_rows(rows, progress, width)
+        return
+
+    if action == 'assign':
+        if len(args) < 2:
+            print('Usage: solo-ops fleet assign <name> "<task>" [provider] [--model <m>]', file=sys.stderr)
+            sys.exit(1)
+        name = args[0]
+        repos = [repo for repo in repos
+                 if Path(repo, find_wt_base(repo), name, 'agents', 'teams', name).is_dir()]
+        if not repos:
+            print(f"Error: no fleet repo has role '{name}'", file=sys.stderr)
+            sys.exit(1)
+
+    failed = 0
+    for repo, returncode, output in fleet_run(repos, [action, *args], panes):
+        mark = '✓' if returncode == 0 else '✗'
+        failed += returncode != 0
+        print(f"{mark} {repo}")
+        for line in output.splitlines():
+            print(f"  {line}")
+    if failed:
+        sys.exit(1)
+
+
+def cmd_archive(args):
+    root = find_git_root()
+    wt_base = find_wt_base(root)
+
+    if args and args[0] == 'show':
+        if len(args) < 3:
+            print("Usage: solo-ops archive show <name> <task-id|slug>", file=sys.stderr)
+            sys.exit(1)
+        name, key = args[1], args[2]
+        teams_dir = Path(root, wt_base, name, 'agents', 'teams', name)
+        matches = archive_lookup(teams_dir, key)
+        if not matches:
+            print(f"Error: no archived task matching '{key}' for '{name}'", file=sys.stderr)
+            sys.exit(1)
+        if len(matches) > 1:
+            print(f"Multiple archived tasks match '{key}':")
+            for stem, entry in matches:
+                print(f"  {stem}  ({entry['archive']})")
+            return
+        print(archive_read(teams_dir, matches[0][1]), end='')
+        return
+
+    days = ARCHIVE_DAYS
+    names = []
+    i = 0
+    while i < len(args):
+        if args[i] == '--older-than':
+            if i + 1 >= len(args) or not args[i + 1].isdigit():
+                print("Usage: solo-ops archive [name] [--older-than <days>]", file=sys.stderr)
+                sys.exit(1)
+            days = int(args[i + 1])
+            i += 2
+            continue
+        names.append(args[i])
+        i += 1
+
+    roles = names or list_roles(root, wt_base)
+    if not roles:
+        print("No roles found. Create one with: solo-ops create <name>")
+        return
+    for role in roles:
+        teams_dir = Path(root, wt_base, role, 'agents', 'teams', role)
+        if not teams_dir.is_dir():
+            print(f"Error: role '{role}' not found", file=sys.stderr)
+            sys.exit(1)
+        with role_lock(root, role):
+            count = archive_role(teams_dir, days)
+        print(f"✓ {role}: archived {count} task(s) older than {days} day(s)")
 
 
 def cmd_install():
@@ -577,9 +1859,23 @@ def main_for_test(args):
     elif cmd == 'reply':
         cmd_reply(rest[0] if rest else '', rest[1] if len(rest) > 1 else '')
     elif cmd == 'status':
-        cmd_status()
+        cmd_status('--progress' in rest)
     elif cmd == 'merge':
         cmd_merge(rest[0] if rest else '')
+    elif cmd == 'archive':
+        cmd_archive(rest)
+    elif cmd == 'fleet':
+        cmd_fleet(rest[0] if rest else '', rest[1:])
+    elif cmd == 'adopt':
+        open_missing = '--no-open' not in rest
+        provider, model = parse_provider_and_model([a for a in rest if a != '--no-open'])
+        cmd_adopt(open_missing, provider, model)
+    elif cmd == 'doctor':
+        cmd_doctor('--dry-run' in rest)
+    elif cmd == 'context':
+        cmd_context(rest[0] if rest else '')
+    elif cmd == 'pool':
+        cmd_pool(rest[0] if rest else '', rest[1] if len(rest) > 1 else '')
     elif cmd in ('help', ''):
         print(HELP_TEXT)
     else:
@@ -594,9 +1890,23 @@ solo-ops — AI team role manager
   open <name> [provider] [--model <m>]   Open role session (provider: claude|codex|opencode)
   open-all [provider] [--model <m>]      Open all role sessions
   assign <name> "<task>" [provider] [--model <m>]   Write task file + notify session
-  reply <name> "<answer>"                Send a reply to a role's running session
-  status                                 Show all roles, running state, pending task count
+  reply <name> "<answer>"                Send a reply to a role's session (queued if offline)
+  status [--progress]                    Show all roles, running state, pending task count
+                                         (--progress: ahead/behind, last commit, diffstat)
   merge <name>                           Merge team/<name> branch back to current branch
+  archive [name] [--older-than <days>]   Pack done tasks into monthly archives (default: 30 days)
+  archive show <name> <task-id|slug>     Print an archived task
+  fleet add [path] | remove <path> | list
+  fleet status [--progress]              Status of every registered repo in one view
+  fleet open-all [provider] [--model <m>]
+  fleet assign <name> "<task>" [provider] [--model <m>]
+                                         Run across all fleet repos concurrently
+  adopt [--no-open] [provider] [--model <m>]
+                                         Re-attach roles to live panes after a restart,
+                                         relaunching roles with no matching pane
+  doctor [--dry-run]                     Reconcile worktrees, team/* branches and pane ids
+  context [name]                         Re-render CLAUDE.md (if changed) and report its size
+  pool fill [size] | status | drain      Manage the pre-warmed shell pool used by open
 
 Providers: claude, codex, opencode (default: claude)
 Model flag: --model <model-identifier>  Specify AI model (e.g., claude-sonnet-4-6, openai/gpt-5)
@@ -608,6 +1918,16 @@ Run as:
 
 Tmux backend:
   SOLO_OPS_BACKEND=tmux python3 <skill-base-dir>/scripts/solo_ops.py <command>
+
+Fleet registry:
+  SOLO_OPS_FLEET=<file>   Repo list for fleet commands (default: ~/.config/solo-ops/fleet)
+
+Task archive:
+  SOLO_OPS_ARCHIVE_THRESHOLD=<n>  assign auto-archives a role once tasks/done holds more than <n> files
+
+Shell pool:
+  SOLO_OPS_POOL_SIZE=<n>  Keep <n> initialized shells ready; open claims one instead of
+                          spawning a new shell and waiting for it to initialize
 """
 
 
@@ -1,4 +1,6 @@
 import importlib.util
+import os
+import time
 import unittest
 from pathlib import Path
 from unittest.mock import patch
@@ -231,3 +233,702 @@ class TmuxBackendTests(unittest.TestCase):
                 ["tmux", "send-keys", "-t", "%9", "Enter"],
             ],
         )
+
+
+class ShellPoolTests(unittest.TestCase):
+    def _pool_panes(self, root, *ids):
+        return {
+            pane: {"cwd": str(root), "title": "solo-ops-pool", "fingerprint": f"tmux:1:/dev/pts/{pane[1:]}"}
+            for pane in ids
+        }
+
+    def test_pool_claim_skips_dead_panes_and_keeps_the_rest(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / ".git").mkdir()
+            m.pool_write(tmpdir, [
+                ("%1", 0.0, "tmux:1:/dev/pts/1"),
+                ("%2", 0.0, "tmux:1:/dev/pts/2"),
+                ("%3", 0.0, "tmux:1:/dev/pts/3"),
+            ])
+
+            with patch.object(m, "pane_inventory", return_value=self._pool_panes(tmpdir, "%2", "%3")):
+                with patch.object(m.time, "sleep") as sleep_mock:
+                    self.assertEqual(m.pool_claim(tmpdir), "%2")
+
+            sleep_mock.assert_not_called()
+            self.assertEqual(m.pool_read(tmpdir), [("%3", 0.0, "tmux:1:/dev/pts/3")])
+
+    def test_reused_pane_id_is_not_treated_as_pool_pane(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / ".git").mkdir()
+            m.pool_write(tmpdir, [("%0", 0.0, "tmux:1:/dev/pts/0"), ("%2", 0.0, "")])
+            # After a server restart %0 and %2 belong to someone else's sessions
+            panes = {
+                "%0": {"cwd": str(tmpdir), "title": "solo-ops-pool", "fingerprint": "tmux:2:/dev/pts/0"},
+                "%2": {"cwd": "/home/user", "title": "user3", "fingerprint": "tmux:2:/dev/pts/2"},
+            }
+
+            with patch.object(m, "pane_inventory", return_value=panes):
+                with patch.object(m, "pane_kill") as kill_mock:
+                    self.assertEqual(m.pool_claim(tmpdir), "")
+                    m.pool_write(tmpdir, [("%0", 0.0, "tmux:1:/dev/pts/0"), ("%2", 0.0, "")])
+                    with patch.object(m, "find_git_root", return_value=tmpdir):
+                        with patch("builtins.print"):
+                            m.cmd_pool("drain")
+                with patch.object(m, "spawn_session", return_value="") as spawn_mock:
+                    m.pool_write(tmpdir, [("%0", 0.0, "tmux:1:/dev/pts/0")])
+                    self.assertEqual(m.pool_fill(tmpdir, 1), 0)
+
+            kill_mock.assert_not_called()
+            spawn_mock.assert_called_once()
+            self.assertEqual(m.pool_read(tmpdir), [])
+
+    def test_open_uses_pooled_pane_without_spawning(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            teams_dir = root / ".worktrees" / "demo" / "agents" / "teams" / "demo"
+            teams_dir.mkdir(parents=True)
+            (teams_dir / "config.yaml").write_text('pane_id: ""\n')
+
+            sent = []
+            with patch.dict(m.os.environ, {"SOLO_OPS_POOL_SIZE": "2"}):
+                with patch.object(m, "find_git_root", return_value=str(root)):
+                    with patch.object(m, "pool_claim", return_value="%7"):
+                        with patch.object(m, "spawn_session") as spawn_mock:
+                            with patch.object(m, "pane_set_title"):
+                                with patch.object(m, "pool_refill_async") as refill_mock, \
+                                        patch.object(m, "pane_inventory", return_value={}):
+                                    with patch.object(m, "pane_send", side_effect=lambda p, t: sent.append((p, t))):
+                                        with patch("builtins.print"):
+                                            m.cmd_open("demo", "codex")
+
+            spawn_mock.assert_not_called()
+            refill_mock.assert_called_once()
+            self.assertEqual(sent[0][0], "%7")
+            self.assertTrue(sent[0][1].startswith("cd "))
+            self.assertEqual(sent[-1], ("%7", m.build_launch_cmd("codex", "")))
+            self.assertEqual(m.cfg_get(str(teams_dir / "config.yaml"), "pane_id"), "%7")
+
+
+class RoleContextTests(unittest.TestCase):
+    def _make_role(self, root):
+        teams_dir = root / ".worktrees" / "demo" / "agents" / "teams" / "demo"
+        teams_dir.mkdir(parents=True)
+        (teams_dir / "prompt.md").write_text("# Role: demo\n")
+        return root / ".worktrees" / "demo"
+
+    def test_render_orders_shared_then_prompt_then_environment(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            wt_path = self._make_role(root)
+            shared = root / "agents" / "shared"
+            shared.mkdir(parents=True)
+            (shared / "b.md").write_text("# Shared B\n")
+            (shared / "a.md").write_text("# Shared A\n")
+
+            text = m.render_role_context(str(root), wt_path, "demo")
+
+            positions = [text.index(marker) for marker in (
+                "# Shared A", "# Shared B", "# Role: demo", "## Development Environment",
+            )]
+            self.assertEqual(positions, sorted(positions))
+
+    def test_write_skips_unchanged_content(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            wt_path = self._make_role(root)
+
+            path, changed, size = m.write_role_context(str(root), wt_path, "demo")
+            self.assertTrue(changed)
+            self.assertEqual(size, len(path.read_bytes()))
+            mtime = path.stat().st_mtime_ns
+
+            _, changed, _ = m.write_role_context(str(root), wt_path, "demo")
+            self.assertFalse(changed)
+            self.assertEqual(path.stat().st_mtime_ns, mtime)
+
+
+class WorktreeReconcileTests(unittest.TestCase):
+    PORCELAIN = (
+        "worktree /repo\nHEAD abc\nbranch refs/heads/main\n\n"
+        "worktree /repo/.worktrees/dev\nHEAD def\nbranch refs/heads/team/dev\n\n"
+        "worktree /repo/.worktrees/gone\nHEAD 123\nbranch refs/heads/team/gone\n"
+        "prunable gitdir file points to non-existent location\n\n"
+        "worktree /repo/.worktrees/tmp\nHEAD 456\ndetached\n\n"
+    )
+
+    def test_team_worktrees_parses_porcelain(self):
+        m = load_module()
+
+        with patch.object(
+            m.subprocess,
+            "run",
+            return_value=subprocess.CompletedProcess([], 0, stdout=self.PORCELAIN, stderr=""),
+        ):
+            worktrees = m.team_worktrees("/repo")
+
+        self.assertEqual(sorted(worktrees), ["dev", "gone"])
+        self.assertEqual(worktrees["dev"]["path"], "/repo/.worktrees/dev")
+        self.assertFalse(worktrees["dev"]["prunable"])
+        self.assertTrue(worktrees["gone"]["prunable"])
+
+    def test_doctor_prunes_orphans_and_clears_stale_pane_ids(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            wt_path = root / ".worktrees" / "dev"
+            teams_dir = wt_path / "agents" / "teams" / "dev"
+            teams_dir.mkdir(parents=True)
+            config = teams_dir / "config.yaml"
+            config.write_text('pane_id: "%5"\n')
+            worktrees = {
+                "dev": {"path": str(wt_path), "branch": "refs/heads/team/dev", "prunable": False},
+                "gone": {"path": str(root / ".worktrees" / "gone"),
+                         "branch": "refs/heads/team/gone", "prunable": True},
+            }
+
+            calls = []
+
+            def fake_run(args, **kwargs):
+                calls.append(args)
+                return subprocess.CompletedProcess(args, 0)
+
+            with patch.object(m, "find_git_root", return_value=str(root)):
+                with patch.object(m, "team_worktrees", return_value=worktrees):
+                    with patch.object(m, "team_branches", return_value=["dev", "gone", "lost"]):
+                        with patch.object(m, "pane_inventory", return_value={}):
+                            with patch.object(m.subprocess, "run", side_effect=fake_run):
+                                with patch("builtins.print") as print_mock:
+                                    m.cmd_doctor()
+
+            self.assertIn(["git", "worktree", "prune"], calls)
+            self.assertEqual(m.cfg_get(str(config), "pane_id"), "")
+            output = "\n".join(str(c.args[0]) for c in print_mock.call_args_list if c.args)
+            self.assertIn("'team/lost' has no worktree", output)
+
+
+class BranchProgressTests(unittest.TestCase):
+    def test_parse_shortstat(self):
+        m = load_module()
+        self.assertEqual(
+            m.parse_shortstat(" 3 files changed, 10 insertions(+), 2 deletions(-)\n"),
+            "3f +10 -2",
+        )
+        self.assertEqual(m.parse_shortstat(" 1 file changed, 1 deletion(-)\n"), "1f +0 -1")
+        self.assertEqual(m.parse_shortstat(""), "-")
+
+    def test_uses_batched_ahead_behind_and_parallel_diffstat(self):
+        m = load_module()
+        calls = []
+
+        def fake_run(args, **kwargs):
+            calls.append(args)
+            if args[1] == "for-each-ref":
+                return subprocess.CompletedProcess(
+                    args, 0,
+                    stdout="team/dev\t2 hours ago\t3 1\nteam/qa\t1 day ago\t0 4\n",
+                    stderr="",
+                )
+            return subprocess.CompletedProcess(
+                args, 0, stdout=" 2 files changed, 5 insertions(+)\n", stderr=""
+            )
+
+        with patch.object(m.subprocess, "run", side_effect=fake_run):
+            progress = m.branch_progress("/repo", "main", ["dev", "qa"])
+
+        self.assertEqual(progress["dev"]["ahead"], "3")
+        self.assertEqual(progress["qa"]["behind"], "4")
+        self.assertEqual(progress["dev"]["last_commit"], "2 hours ago")
+        self.assertEqual(progress["qa"]["diffstat"], "2f +5 -0")
+        self.assertFalse(any(args[1] == "rev-list" for args in calls))
+        self.assertEqual(sum(1 for args in calls if args[1] == "for-each-ref"), 1)
+
+    def test_falls_back_to_rev_list_without_ahead_behind_atom(self):
+        m = load_module()
+
+        def fake_run(args, **kwargs):
+            if args[1] == "for-each-ref":
+                if any("ahead-behind" in a for a in args):
+                    return subprocess.CompletedProcess(args, 128, stdout="", stderr="fatal")
+                return subprocess.CompletedProcess(args, 0, stdout="team/dev\tnow\n", stderr="")
+            if args[1] == "rev-list":
+                return subprocess.CompletedProcess(args, 0, stdout="2\t7\n", stderr="")
+            return subprocess.CompletedProcess(args, 0, stdout="", stderr="")
+
+        with patch.object(m.subprocess, "run", side_effect=fake_run):
+            progress = m.branch_progress("/repo", "main", ["dev"])
+
+        self.assertEqual((progress["dev"]["ahead"], progress["dev"]["behind"]), ("2", "7"))
+
+
+class LockingTests(unittest.TestCase):
+    def test_concurrent_cfg_set_keeps_every_key(self):
+        m = load_module()
+        import threading
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = Path(tmpdir) / "config.yaml"
+            config.write_text('name: demo\npane_id: ""\n')
+
+            def worker(i):
+                for j in range(20):
+                    m.cfg_set(str(config), f"key_{i}", str(j))
+
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            for i in range(8):
+                self.assertEqual(m.cfg_get(str(config), f"key_{i}"), "19")
+            self.assertEqual(m.cfg_get(str(config), "name"), "demo")
+
+    def test_role_lock_is_reentrant_and_excludes_other_threads(self):
+        m = load_module()
+        import threading
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / ".git").mkdir()
+            acquired = threading.Event()
+
+            def contender():
+                with m.role_lock(tmpdir, "demo"):
+                    acquired.set()
+
+            with m.role_lock(tmpdir, "demo"):
+                with m.role_lock(tmpdir, "demo"):
+                    t = threading.Thread(target=contender)
+                    t.start()
+                    self.assertFalse(acquired.wait(0.2))
+            t.join(2)
+            self.assertTrue(acquired.is_set())
+
+    def test_new_task_file_retries_on_id_collision(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch.object(m, "datetime") as datetime_mock:
+                datetime_mock.now.return_value.strftime.return_value = "2026-01-02-03-04-05"
+                with patch.object(m.secrets, "token_hex", side_effect=["abcd", "abcd", "ef01"]):
+                    first = m.new_task_file(tmpdir, "fix-bug")
+                    second = m.new_task_file(tmpdir, "fix-bug")
+
+            self.assertNotEqual(first, second)
+            self.assertTrue(first.name.endswith("-abcd-fix-bug.md"))
+            self.assertTrue(second.name.endswith("-ef01-fix-bug.md"))
+
+
+class AdoptTests(unittest.TestCase):
+    def test_role_pane_rejects_reused_id_with_different_fingerprint(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = Path(tmpdir) / "config.yaml"
+            config.write_text('pane_id: %3\npane_fingerprint: "tmux:100:/dev/pts/3"\n')
+            panes = {"%3": {"cwd": "/x", "title": "dev", "fingerprint": "tmux:200:/dev/pts/3"}}
+            self.assertEqual(m.role_pane(config, panes), "")
+
+            panes["%3"]["fingerprint"] = "tmux:100:/dev/pts/3"
+            self.assertEqual(m.role_pane(config, panes), "%3")
+
+    def test_match_panes_prefers_path_and_title_and_assigns_each_pane_once(self):
+        m = load_module()
+        panes = {
+            "%1": {"cwd": "/repo/.worktrees/dev/src", "title": "dev", "fingerprint": ""},
+            "%2": {"cwd": "/repo/.worktrees/dev", "title": "zsh", "fingerprint": ""},
+            "%3": {"cwd": "", "title": "qa", "fingerprint": ""},
+            "%4": {"cwd": "/repo", "title": "solo-ops-pool", "fingerprint": ""},
+            "%5": {"cwd": "/repo", "title": "ops", "fingerprint": ""},
+        }
+        matched = m.match_panes(
+            {"dev": "/repo/.worktrees/dev", "qa": "/repo/.worktrees/qa", "ops": "/repo/.worktrees/ops"},
+            panes,
+            "/repo",
+        )
+        self.assertEqual(matched, {"dev": "%1", "qa": "%3", "ops": "%5"})
+
+    def test_match_panes_ignores_same_titled_pane_in_another_repo(self):
+        m = load_module()
+        panes = {"%5": {"cwd": "/srv/other-repo/.worktrees/dev", "title": "dev", "fingerprint": ""}}
+        matched = m.match_panes({"dev": "/srv/repo-a/.worktrees/dev"}, panes, "/srv/repo-a")
+        self.assertEqual(matched, {})
+
+    def test_adopt_rewrites_pane_ids_and_relaunches_only_missing_roles(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            configs = {}
+            for role in ("dev", "qa"):
+                teams_dir = root / ".worktrees" / role / "agents" / "teams" / role
+                teams_dir.mkdir(parents=True)
+                configs[role] = teams_dir / "config.yaml"
+                configs[role].write_text('pane_id: "9"\npane_fingerprint: "old"\n')
+            (root / ".git").mkdir()
+            panes = {"4": {"cwd": str(root / ".worktrees" / "dev"), "title": "dev",
+                           "fingerprint": "wezterm:sock:/dev/ttys004"}}
+            opened = []
+
+            with patch.object(m, "find_git_root", return_value=str(root)):
+                with patch.object(m, "list_roles", return_value=["dev", "qa"]):
+                    with patch.object(m, "pane_inventory", return_value=panes):
+                        with patch.object(m, "cmd_open", side_effect=lambda r, p="", mo="": opened.append(r)):
+                            with patch("builtins.print"):
+                                m.cmd_adopt()
+
+            self.assertEqual(m.cfg_get(str(configs["dev"]), "pane_id"), "4")
+            self.assertEqual(m.cfg_get(str(configs["dev"]), "pane_fingerprint"), "wezterm:sock:/dev/ttys004")
+            self.assertEqual(m.cfg_get(str(configs["qa"]), "pane_id"), "")
+            self.assertEqual(opened, ["qa"])
+
+
+class FleetTests(unittest.TestCase):
+    def test_fleet_status_lists_panes_once_and_merges_repos(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            repos = [str(Path(tmpdir) / "alpha"), str(Path(tmpdir) / "beta")]
+            for repo in repos:
+                Path(repo).mkdir()
+            registry = Path(tmpdir) / "fleet"
+            registry.write_text("\n".join(repos) + "\n")
+
+            def fake_collect(root, panes, progress=False):
+                return "", [{"role": f"{Path(root).name}-dev", "pane_id": "", "pending": 1}]
+
+            with patch.dict(m.os.environ, {"SOLO_OPS_FLEET": str(registry)}):
+                with patch.object(m, "pane_inventory", return_value={}) as inventory_mock:
+                    with patch.object(m, "collect_status", side_effect=fake_collect):
+                        with patch("builtins.print") as print_mock:
+                            m.cmd_fleet("status", [])
+
+            inventory_mock.assert_called_once()
+            output = "\n".join(str(c.args[0]) for c in print_mock.call_args_list if c.args)
+            self.assertIn("alpha-dev", output)
+            self.assertIn("beta-dev", output)
+
+    def test_fleet_run_shares_pane_inventory_with_children(self):
+        m = load_module()
+        envs = []
+
+        def fake_run(args, **kwargs):
+            envs.append(kwargs["env"])
+            return subprocess.CompletedProcess(args, 0, stdout="ok\n", stderr="")
+
+        panes = {"%1": {"cwd": "/r", "title": "dev", "fingerprint": "tmux:1:/dev/pts/1"}}
+        with patch.object(m.subprocess, "run", side_effect=fake_run):
+            results = m.fleet_run(["/a", "/b"], ["open-all"], panes)
+
+        self.assertEqual([r[0] for r in results], ["/a", "/b"])
+        for env in envs:
+            self.assertEqual(m.json.loads(env[m.PANE_INVENTORY_ENV]), panes)
+
+        with patch.dict(m.os.environ, {m.PANE_INVENTORY_ENV: envs[0][m.PANE_INVENTORY_ENV]}):
+            with patch.object(m.subprocess, "run") as run_mock:
+                self.assertEqual(m.pane_inventory(), panes)
+            run_mock.assert_not_called()
+
+
+class DeliveryTests(unittest.TestCase):
+    def _run_deliver(self, m, root, text):
+        calls = []
+
+        def fake_run(args, **kwargs):
+            calls.append((args, kwargs.get("input")))
+            return subprocess.CompletedProcess(args, 0)
+
+        with patch.dict(m.os.environ, {"SOLO_OPS_BACKEND": "tmux"}):
+            with patch.object(m.subprocess, "run", side_effect=fake_run):
+                with patch.object(m.time, "sleep"):
+                    m.deliver(root, "%9", text)
+        return calls
+
+    def test_short_message_is_typed(self):
+        m = load_module()
+        calls = self._run_deliver(m, "/unused", "hello")
+        self.assertEqual(calls[0][0], ["tmux", "send-keys", "-t", "%9", "-l", "hello"])
+
+    def test_multiline_message_is_pasted_in_one_shot(self):
+        m = load_module()
+        text = "line one\nline two"
+        calls = self._run_deliver(m, "/unused", text)
+        self.assertEqual(calls[0][0][:2], ["tmux", "load-buffer"])
+        self.assertEqual(calls[0][1], text.encode())
+        self.assertEqual(calls[1][0][:3], ["tmux", "paste-buffer", "-p"])
+        self.assertEqual(calls[-1][0], ["tmux", "send-keys", "-t", "%9", "Enter"])
+
+    def test_huge_message_is_spooled_and_sent_as_pointer(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / ".git").mkdir()
+            text = "[Main Controller Reply] see below\n" + "x" * (m.SPOOL_THRESHOLD + 1)
+            calls = self._run_deliver(m, tmpdir, text)
+
+            spooled = list((Path(tmpdir) / ".git" / "solo-ops" / "spool").iterdir())
+            self.assertEqual(len(spooled), 1)
+            self.assertEqual(spooled[0].read_text(), text)
+            sent = calls[0][0][-1]
+            self.assertTrue(sent.startswith("[Main Controller Reply] see below"))
+            self.assertIn(str(spooled[0]), sent)
+
+    def test_spool_pointer_uses_first_non_empty_line(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / ".git").mkdir()
+            text = "\n\n  \nSummary of the diff\n" + "x" * (m.SPOOL_THRESHOLD + 1)
+            calls = self._run_deliver(m, tmpdir, text)
+
+            self.assertTrue(calls[0][0][-1].startswith("Summary of the diff"))
+
+    def test_doctor_removes_old_spooled_messages(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / ".git").mkdir()
+            old = m.spool_message(str(root), "old")
+            fresh = m.spool_message(str(root), "fresh")
+            stamp = time.time() - (m.SPOOL_MAX_AGE_DAYS + 1) * 86400
+            os.utime(old, (stamp, stamp))
+
+            with patch.object(m, "find_git_root", return_value=str(root)):
+                with patch.object(m, "team_worktrees", return_value={}):
+                    with patch.object(m, "team_branches", return_value=[]):
+                        with patch.object(m, "pane_inventory", return_value={}):
+                            with patch("builtins.print"):
+                                m.cmd_doctor(dry_run=True)
+                                self.assertTrue(old.exists())
+                                m.cmd_doctor()
+
+            self.assertFalse(old.exists())
+            self.assertTrue(fresh.exists())
+
+    def test_reply_to_offline_role_is_queued_and_flushed_in_order(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / ".git").mkdir()
+            teams_dir = root / ".worktrees" / "demo" / "agents" / "teams" / "demo"
+            teams_dir.mkdir(parents=True)
+            (teams_dir / "config.yaml").write_text('pane_id: ""\n')
+
+            with patch.object(m, "find_git_root", return_value=str(root)):
+                with patch("builtins.print"):
+                    m.cmd_reply("demo", "first")
+                    m.cmd_reply("demo", "second")
+
+            self.assertEqual(len(m.outbox_pending(str(root), "demo")), 2)
+
+            delivered = []
+            with patch.object(m, "deliver", side_effect=lambda r, p, t: delivered.append((p, t)) or True):
+                self.assertEqual(m.outbox_flush(str(root), "demo", "%4"), 2)
+
+            self.assertEqual(delivered, [
+                ("%4", "[Main Controller Reply] first"),
+                ("%4", "[Main Controller Reply] second"),
+            ])
+            self.assertEqual(m.outbox_pending(str(root), "demo"), [])
+
+
+class ArchiveTests(unittest.TestCase):
+    def _make_done(self, teams_dir, names, age_days):
+        done = teams_dir / "tasks" / "done"
+        done.mkdir(parents=True, exist_ok=True)
+        old = time.time() - age_days * 86400
+        for name in names:
+            path = done / name
+            path.write_text(f"# {name}\n")
+            os.utime(path, (old, old))
+        return done
+
+    def test_packs_old_tasks_per_month_and_reads_them_back(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            teams_dir = Path(tmpdir)
+            done = self._make_done(teams_dir, [
+                "2026-01-05-10-00-00-ab11-fix-login.md",
+                "2026-01-20-10-00-00-ab12-add-cache.md",
+                "2026-02-01-10-00-00-old-style.md",
+            ], age_days=60)
+            self._make_done(teams_dir, ["2026-03-01-10-00-00-ab13-recent.md"], age_days=1)
+
+            self.assertEqual(m.archive_role(teams_dir, 30), 3)
+
+            self.assertEqual([p.name for p in done.iterdir()], ["2026-03-01-10-00-00-ab13-recent.md"])
+            archive_dir = teams_dir / "tasks" / "archive"
+            self.assertEqual(sorted(p.name for p in archive_dir.glob("*.zip")), ["2026-01.zip", "2026-02.zip"])
+
+            [(stem, entry)] = m.archive_lookup(teams_dir, "add-cache")
+            self.assertEqual(stem, "2026-01-20-10-00-00-ab12-add-cache")
+            self.assertEqual(m.archive_lookup(teams_dir, "2026-01-20-10-00-00-ab12"), [(stem, entry)])
+            self.assertEqual(m.archive_read(teams_dir, entry), "# 2026-01-20-10-00-00-ab12-add-cache.md\n")
+            [(_, entry)] = m.archive_lookup(teams_dir, "2026-02-01-10-00-00")
+            self.assertEqual(entry["slug"], "old-style")
+
+    def test_legacy_names_sharing_a_timestamp_stay_retrievable(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            teams_dir = Path(tmpdir)
+            self._make_done(teams_dir, [
+                "2025-01-05-10-00-00-fix-login.md",
+                "2025-01-05-10-00-00-add-cache.md",
+                "2025-01-05-10-00-00-dead-code-cleanup.md",
+            ], age_days=60)
+
+            self.assertEqual(m.archive_role(teams_dir, 30), 3)
+
+            for slug in ("fix-login", "add-cache", "dead-code-cleanup"):
+                [(stem, entry)] = m.archive_lookup(teams_dir, slug)
+                self.assertEqual(stem, f"2025-01-05-10-00-00-{slug}")
+                self.assertEqual(m.archive_read(teams_dir, entry), f"# {stem}.md\n")
+            self.assertEqual(len(m.archive_lookup(teams_dir, "2025-01-05-10-00-00")), 3)
+
+    def test_rerun_does_not_duplicate_members(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            teams_dir = Path(tmpdir)
+            name = "2026-01-05-10-00-00-ab11-fix-login.md"
+            self._make_done(teams_dir, [name], age_days=60)
+            m.archive_role(teams_dir, 30)
+            self._make_done(teams_dir, [name], age_days=60)
+            m.archive_role(teams_dir, 30)
+
+            with m.zipfile.ZipFile(teams_dir / "tasks" / "archive" / "2026-01.zip") as zf:
+                self.assertEqual(zf.namelist(), [name])
+
+    def test_auto_archive_only_past_threshold(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            teams_dir = Path(tmpdir)
+            self._make_done(teams_dir, [
+                f"2026-01-0{i}-10-00-00-ab1{i}-task.md" for i in range(1, 4)
+            ], age_days=60)
+
+            with patch.dict(m.os.environ, {"SOLO_OPS_ARCHIVE_THRESHOLD": "3"}):
+                self.assertEqual(m.archive_if_over_threshold(teams_dir), 0)
+            with patch.dict(m.os.environ, {"SOLO_OPS_ARCHIVE_THRESHOLD": "2"}):
+                self.assertEqual(m.archive_if_over_threshold(teams_dir), 3)
+
+
+class WeztermFingerprintTests(unittest.TestCase):
+    def test_mux_id_is_the_same_with_or_without_caller_socket(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            runtime = Path(tmpdir) / "wezterm"
+            runtime.mkdir()
+            sock = runtime / f"gui-sock-{os.getpid()}"
+            sock.touch()
+            (runtime / "gui-sock-999999999").touch()  # dead GUI
+
+            with patch.dict(m.os.environ, {"XDG_RUNTIME_DIR": tmpdir}, clear=False):
+                m.os.environ.pop("WEZTERM_UNIX_SOCKET", None)
+                outside = m.wezterm_mux_id()
+                with patch.dict(m.os.environ, {"WEZTERM_UNIX_SOCKET": str(sock)}):
+                    inside = m.wezterm_mux_id()
+
+            self.assertEqual(outside, sock.name)
+            self.assertEqual(inside, outside)
+
+    def test_unknown_server_falls_back_to_tty_comparison(self):
+        m = load_module()
+        self.assertTrue(m.fingerprints_match("wezterm::/dev/ttys004", "wezterm:gui-sock-1:/dev/ttys004"))
+        self.assertTrue(m.fingerprints_match("wezterm:gui-sock-1:/dev/ttys004", "wezterm::/dev/ttys004"))
+        self.assertFalse(m.fingerprints_match("wezterm:gui-sock-1:/dev/ttys004", "wezterm:gui-sock-2:/dev/ttys004"))
+        self.assertFalse(m.fingerprints_match("wezterm::/dev/ttys004", "wezterm::/dev/ttys005"))
+        self.assertFalse(m.fingerprints_match("tmux:1:/dev/pts/1", "tmux:2:/dev/pts/1"))
+
+
+class OutboxOrderTests(unittest.TestCase):
+    def test_live_reply_flushes_queued_messages_first(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / ".git").mkdir()
+            teams_dir = root / ".worktrees" / "demo" / "agents" / "teams" / "demo"
+            teams_dir.mkdir(parents=True)
+            (teams_dir / "config.yaml").write_text('pane_id: ""\n')
+
+            delivered = []
+            with patch.object(m, "find_git_root", return_value=str(root)):
+                with patch.object(m, "deliver", side_effect=lambda r, p, t: delivered.append((p, t)) or True):
+                    with patch("builtins.print"):
+                        m.cmd_reply("demo", "first")
+                        m.cmd_reply("demo", "second")
+                        # The role comes back without going through `open`
+                        with patch.object(m, "role_pane", return_value="%4"):
+                            m.cmd_reply("demo", "third")
+
+            self.assertEqual(delivered, [
+                ("%4", "[Main Controller Reply] first"),
+                ("%4", "[Main Controller Reply] second"),
+                ("%4", "[Main Controller Reply] third"),
+            ])
+            self.assertEqual(m.outbox_pending(str(root), "demo"), [])
+
+
+    def test_failed_delivery_keeps_remaining_messages_queued(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / ".git").mkdir()
+            teams_dir = root / ".worktrees" / "demo" / "agents" / "teams" / "demo"
+            teams_dir.mkdir(parents=True)
+            (teams_dir / "config.yaml").write_text('pane_id: ""\n')
+
+            attempts = []
+            with patch.object(m, "find_git_root", return_value=str(root)):
+                with patch("builtins.print"):
+                    m.cmd_reply("demo", "first")
+                    m.cmd_reply("demo", "second")
+                    # The pane dies while the outbox is being flushed
+                    with patch.object(m, "role_pane", return_value="%4"):
+                        with patch.object(m, "deliver", side_effect=lambda r, p, t: attempts.append(t) or len(attempts) < 2):
+                            m.cmd_reply("demo", "third")
+
+            self.assertEqual(attempts, [
+                "[Main Controller Reply] first",
+                "[Main Controller Reply] second",
+            ])
+            self.assertEqual(
+                [msg.read_text() for msg in m.outbox_pending(str(root), "demo")],
+                ["[Main Controller Reply] second", "[Main Controller Reply] third"],
+            )
+
+class FleetSnapshotTests(unittest.TestCase):
+    def test_role_without_fingerprint_uses_shared_snapshot(self):
+        m = load_module()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config = Path(tmpdir) / "config.yaml"
+            config.write_text('pane_id: "%3"\n')
+            snapshot = {"%3": {"cwd": "/r", "title": "dev", "fingerprint": "tmux:1:/dev/pts/3"}}
+
+            with patch.dict(m.os.environ, {m.PANE_INVENTORY_ENV: m.json.dumps(snapshot)}):
+                with patch.object(m.subprocess, "run") as run_mock:
+                    self.assertEqual(m.role_pane(config), "%3")
+                    config.write_text('pane_id: "%8"\n')
+                    self.assertEqual(m.role_pane(config), "")
+
+            run_mock.assert_not_called()